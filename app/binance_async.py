@@ -0,0 +1,121 @@
+import hashlib
+import hmac
+import time
+import uuid
+from typing import Dict, List
+from urllib.parse import urlencode
+
+import aiohttp
+import orjson
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the application-wide HTTP session with a keep-alive connection pool"""
+    connector = aiohttp.TCPConnector(limit=50, keepalive_timeout=75)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=10)
+    )
+
+
+class AsyncBinanceClient:
+    FUTURES_URL = "https://fapi.binance.com/fapi"
+    FUTURES_TESTNET_URL = "https://testnet.binancefuture.com/fapi"
+    RECV_WINDOW = 5000
+    # Order types Binance only accepts through the algo order endpoint
+    CONDITIONAL_ORDER_TYPES = ("STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET")
+
+    def __init__(self, api_key: str, api_secret: str, session: aiohttp.ClientSession,
+                 testnet: bool = True):
+        """
+        Initialize an async Binance Futures REST client on a shared session
+
+        Args:
+            api_key (str): Binance API key
+            api_secret (str): Binance API secret
+            session (aiohttp.ClientSession): Shared HTTP session
+            testnet (bool): Whether to use testnet (default: True)
+        """
+        self.api_key = api_key or ""
+        self.api_secret = api_secret or ""
+        self.session = session
+        self.base_url = self.FUTURES_TESTNET_URL if testnet else self.FUTURES_URL
+        self.headers = {"X-MBX-APIKEY": self.api_key}
+
+    def _build_query(self, params: Dict, signed: bool) -> str:
+        """Encode request parameters, adding timestamp and HMAC-SHA256 signature when signed"""
+        params = {k: v for k, v in params.items() if v is not None}
+        if signed:
+            params["timestamp"] = int(time.time() * 1000)
+            params["recvWindow"] = self.RECV_WINDOW
+        query_string = urlencode(params)
+        if signed:
+            signature = hmac.new(
+                self.api_secret.encode("utf-8"),
+                query_string.encode("utf-8"),
+                hashlib.sha256
+            ).hexdigest()
+            query_string = f"{query_string}&signature={signature}"
+        return query_string
+
+    async def _request(self, method: str, path: str, signed: bool = False, **params):
+        query_string = self._build_query(params, signed)
+        url = f"{self.base_url}/{path}"
+        if query_string:
+            url = f"{url}?{query_string}"
+
+        async with self.session.request(method, url, headers=self.headers) as response:
+            body = await response.read()
+            if not 200 <= response.status < 300:
+                raise BinanceAPIException(response, response.status, body.decode("utf-8", "replace"))
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                raise BinanceRequestException(f"Invalid Response: {body.decode('utf-8', 'replace')}")
+
+    async def futures_ping(self) -> Dict:
+        return await self._request("GET", "v1/ping")
+
+    async def futures_exchange_info(self) -> Dict:
+        return await self._request("GET", "v1/exchangeInfo")
+
+    async def futures_symbol_ticker(self, **params) -> Dict:
+        return await self._request("GET", "v1/ticker/price", **params)
+
+    async def futures_historical_trades(self, **params) -> List[Dict]:
+        return await self._request("GET", "v1/historicalTrades", **params)
+
+    async def futures_account(self, **params) -> Dict:
+        return await self._request("GET", "v2/account", signed=True, **params)
+
+    async def futures_position_information(self, **params) -> List[Dict]:
+        return await self._request("GET", "v2/positionRisk", signed=True, **params)
+
+    async def futures_create_order(self, **params) -> Dict:
+        if str(params.get("type", "")).upper() in self.CONDITIONAL_ORDER_TYPES:
+            return await self.futures_create_algo_order(**params)
+        return await self._request("POST", "v1/order", signed=True, **params)
+
+    async def futures_create_algo_order(self, **params) -> Dict:
+        """Place a conditional order, which Binance identifies by clientAlgoId and triggers at triggerPrice"""
+        params.pop("newClientOrderId", None)
+        params.setdefault("clientAlgoId", uuid.uuid4().hex)
+        params.setdefault("algoType", "CONDITIONAL")
+        if "stopPrice" in params and "triggerPrice" not in params:
+            params["triggerPrice"] = params.pop("stopPrice")
+        return await self._request("POST", "v1/algoOrder", signed=True, **params)
+
+    async def futures_cancel_order(self, **params) -> Dict:
+        return await self._request("DELETE", self._order_path(params), signed=True, **params)
+
+    async def futures_get_order(self, **params) -> Dict:
+        return await self._request("GET", self._order_path(params), signed=True, **params)
+
+    @staticmethod
+    def _order_path(params: Dict) -> str:
+        """Conditional orders are looked up and cancelled through the algo order endpoint"""
+        return "v1/algoOrder" if "algoId" in params or "clientAlgoId" in params else "v1/order"
+
+    async def futures_get_open_orders(self, **params) -> List[Dict]:
+        return await self._request("GET", "v1/openOrders", signed=True, **params)
@@ -1,61 +1,138 @@
 import logging
+import asyncio
+import io
 import time
-import json
+import queue
+from dataclasses import dataclass
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+import aiohttp
 from binance import Client
 from binance.exceptions import BinanceAPIException, BinanceOrderException
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
+from tabulate import tabulate
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("trading_bot.log"),
-        logging.StreamHandler()
-    ]
-)
+from app.binance_async import AsyncBinanceClient
+from app.ratelimit import TokenBucket
+
+# Set up logging: records are queued and written by a background listener thread
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_file_handler = logging.FileHandler("trading_bot.log", delay=True)
+log_file_handler.setFormatter(log_formatter)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, log_file_handler, log_stream_handler)
 logger = logging.getLogger("TradingBot")
 
+
+@dataclass
+class SymbolMeta:
+    """Pre-parsed trading constraints for one symbol"""
+    __slots__ = ('step_size', 'inv_step', 'step_decimals', 'min_qty', 'max_qty', 'price_tick')
+
+    step_size: float
+    inv_step: float
+    step_decimals: int
+    min_qty: float
+    max_qty: float
+    price_tick: float
+
+    @classmethod
+    def from_filters(cls, lot: Dict, price_filter: Optional[Dict] = None) -> 'SymbolMeta':
+        """Build from a LOT_SIZE filter and an optional PRICE_FILTER"""
+        step_size = float(lot['stepSize'])
+        _, _, fraction = lot['stepSize'].rstrip('0').partition('.')
+        return cls(
+            step_size=step_size,
+            inv_step=1.0 / step_size,
+            step_decimals=len(fraction),
+            min_qty=float(lot['minQty']),
+            max_qty=float(lot['maxQty']),
+            price_tick=float(price_filter['tickSize']) if price_filter else 0.0
+        )
+
+
 class EnhancedTradingBot:
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    def __init__(self, api_key: str, api_secret: str, session: aiohttp.ClientSession,
+                 testnet: bool = True):
         """
         Initialize the enhanced trading bot with API credentials
         
         Args:
             api_key (str): Binance API key
             api_secret (str): Binance API secret
+            session (aiohttp.ClientSession): Shared HTTP session used for all requests
             testnet (bool): Whether to use testnet (default: True)
         """
         try:
-            # Configure client with rate limiting
-            self.client = Client(
-                api_key, 
-                api_secret, 
-                testnet=testnet,
-                requests_params={'timeout': 10}
-            )
-            self.rate_limit_delay = 0.1  # 100ms between requests to avoid rate limiting
-            self.last_request_time = 0
+            # Configure client on the shared keep-alive session
+            self.client = AsyncBinanceClient(api_key, api_secret, session, testnet=testnet)
+            # Binance Futures limits: 1200 request weight/min and 100 orders/10s
+            self.weight_bucket = TokenBucket(capacity=1200, rate=1200 / 60)
+            self.order_bucket = TokenBucket(capacity=100, rate=10)
+            # Exchange metadata rarely changes, so it is cached in memory
+            self._exchange_info_ts = None
+            self._exchange_info_ttl = 3600
+            self._exchange_info_future: Optional[asyncio.Future] = None
+            self._symbol_index = {}
+            self._meta: Dict[str, SymbolMeta] = {}
+            # Balance and mark prices pushed by app.streams.BotStreams
+            self.cache = {'USDT_balance': None, 'price': {}}
             logger.info("Enhanced trading bot initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize client: {e}")
             raise
 
-    def _rate_limit(self):
-        """Enforce rate limiting between API requests"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+    async def _call(self, weight: int, fn, *args, order: bool = False, **kwargs):
+        """
+        Rate-limit and run a Binance client call, backing off on rate-limit errors
+        
+        Args:
+            weight (int): Request weight of the endpoint
+            fn: Client coroutine function to call
+            order (bool): Whether the call also counts against the order limit
+            
+        Returns:
+            The client call's response
+        """
+        for attempt in range(2):
+            if order:
+                await self.order_bucket.acquire(1)
+            await self.weight_bucket.acquire(weight)
+            try:
+                return await fn(*args, **kwargs)
+            except BinanceAPIException as e:
+                if attempt or not self._is_rate_limited(e):
+                    raise
+                retry_after = self._retry_after(e)
+                logger.warning(f"Rate limited by Binance (code {e.code}), backing off {retry_after}s")
+                self.weight_bucket.drain_for(retry_after)
+                if e.code == -1015:
+                    self.order_bucket.drain_for(retry_after)
+
+    @staticmethod
+    def _is_rate_limited(e: BinanceAPIException) -> bool:
+        return e.code in (-1003, -1015) or e.status_code in (418, 429)
 
-    def get_account_info(self) -> Optional[Dict]:
+    @staticmethod
+    def _retry_after(e: BinanceAPIException) -> float:
+        """Seconds to back off, from the Retry-After header when Binance sends one"""
+        headers = getattr(e.response, 'headers', None) or {}
+        try:
+            return float(headers.get('Retry-After', 60))
+        except ValueError:
+            return 60.0
+
+    async def get_account_info(self) -> Optional[Dict]:
         """Get futures account information including balances"""
         try:
-            self._rate_limit()
-            account_info = self.client.futures_account()
+            account_info = await self._call(5, self.client.futures_account)
             logger.info("Fetched account information successfully")
             return account_info
         except BinanceAPIException as e:
@@ -64,13 +141,10 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error getting account info: {e}")
         return None
 
-    def get_position_info(self, symbol: str = None) -> Optional[Dict]:
+    async def get_position_info(self, symbol: str = None) -> Optional[Dict]:
         """Get position information for all symbols or a specific symbol"""
         try:
-            self._rate_limit()
-            positions = self.client.futures_position_information()
-            if symbol:
-                positions = [p for p in positions if p['symbol'] == symbol]
+            positions = await self._call(5, self.client.futures_position_information, symbol=symbol)
             logger.info("Fetched position information successfully")
             return positions
         except BinanceAPIException as e:
@@ -79,7 +153,55 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error getting position info: {e}")
         return None
 
-    def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+    async def _get_exchange_info(self):
+        """Make sure the cached symbol metadata is fresh, refreshing it once the TTL has expired"""
+        if (self._exchange_info_ts is not None
+                and time.monotonic() - self._exchange_info_ts < self._exchange_info_ttl):
+            return
+
+        # Concurrent callers share a single in-flight refresh
+        if self._exchange_info_future is None:
+            self._exchange_info_future = asyncio.ensure_future(self._fetch_exchange_info())
+        await asyncio.shield(self._exchange_info_future)
+
+    def _refresh_exchange_info_in_background(self):
+        """Start a refresh once the cached metadata is stale, without waiting for it"""
+        if (self._exchange_info_future is None
+                and time.monotonic() - self._exchange_info_ts >= self._exchange_info_ttl):
+            self._exchange_info_future = asyncio.ensure_future(self._fetch_exchange_info())
+            self._exchange_info_future.add_done_callback(self._log_refresh_error)
+
+    @staticmethod
+    def _log_refresh_error(future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"Background exchange info refresh failed: {future.exception()}")
+
+    async def _fetch_exchange_info(self):
+        """Download exchange info and rebuild the symbol indexes"""
+        try:
+            exchange_info = await self._call(1, self.client.futures_exchange_info)
+        finally:
+            self._exchange_info_future = None
+
+        # Full per-symbol entries are kept for get_symbol_info; the top-level
+        # rate limits, assets and server time are dropped
+        symbol_index = {}
+        meta = {}
+        for info in exchange_info['symbols']:
+            sym = info['symbol']
+            symbol_index[sym] = info
+            filters = {f['filterType']: f for f in info['filters']}
+            lot = filters.get('LOT_SIZE')
+            if lot:
+                price_filter = filters.get('PRICE_FILTER')
+                meta[sym] = SymbolMeta.from_filters(lot, price_filter)
+
+        self._symbol_index = symbol_index
+        self._meta = meta
+        self._exchange_info_ts = time.monotonic()
+        logger.info(f"Refreshed exchange info for {len(symbol_index)} symbols")
+
+    async def get_symbol_info(self, symbol: str) -> Optional[Dict]:
         """
         Get information about a trading symbol
         
@@ -90,17 +212,13 @@ class EnhancedTradingBot:
             dict: Symbol information or None if not found
         """
         try:
-            self._rate_limit()
-            exchange_info = self.client.futures_exchange_info()
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    return s
-            return None
+            await self._get_exchange_info()
+            return self._symbol_index.get(symbol)
         except Exception as e:
             logger.error(f"Error getting symbol info: {e}")
             return None
 
-    def validate_quantity(self, symbol: str, quantity: float) -> Tuple[bool, str]:
+    async def validate_quantity(self, symbol: str, quantity: float) -> Tuple[bool, str]:
         """
         Validate order quantity against symbol's step size
         
@@ -111,32 +229,38 @@ class EnhancedTradingBot:
         Returns:
             tuple: (is_valid, error_message)
         """
-        symbol_info = self.get_symbol_info(symbol)
-        if not symbol_info:
-            return False, f"Symbol {symbol} not found"
-            
-        # Check LOT_SIZE filter
-        for filter in symbol_info['filters']:
-            if filter['filterType'] == 'LOT_SIZE':
-                step_size = float(filter['stepSize'])
-                min_qty = float(filter['minQty'])
-                max_qty = float(filter['maxQty'])
-                
-                # Check if quantity is within min/max bounds
-                if quantity < min_qty:
-                    return False, f"Quantity {quantity} is less than minimum {min_qty}"
-                if quantity > max_qty:
-                    return False, f"Quantity {quantity} is greater than maximum {max_qty}"
-                
-                # Check if quantity is a multiple of step size
-                if round(quantity / step_size, 8) % 1 != 0:
-                    return False, f"Quantity {quantity} must be a multiple of step size {step_size}"
-                
-                return True, ""
-                
-        return True, ""
+        is_valid, error_msg, _ = await self._check_quantity(symbol, quantity)
+        return is_valid, error_msg
+
+    async def _check_quantity(self, symbol: str, quantity: float) -> Tuple[bool, str, Optional['SymbolMeta']]:
+        """Validate quantity and also return the symbol metadata it was checked against"""
+        # Check LOT_SIZE filter, only waiting on exchange info for unknown symbols;
+        # known ones keep using the cached metadata while a stale copy refreshes
+        m = self._meta.get(symbol)
+        if m is not None:
+            self._refresh_exchange_info_in_background()
+        else:
+            symbol_info = await self.get_symbol_info(symbol)
+            if not symbol_info:
+                return False, f"Symbol {symbol} not found", None
+
+            m = self._meta.get(symbol)
+            if m is None:
+                return True, "", None
 
-    def calculate_position_size(self, symbol: str, risk_pct: float, stop_loss: float = None) -> Optional[float]:
+        # Check if quantity is within min/max bounds
+        if quantity < m.min_qty:
+            return False, f"Quantity {quantity} is less than minimum {m.min_qty}", m
+        if quantity > m.max_qty:
+            return False, f"Quantity {quantity} is greater than maximum {m.max_qty}", m
+
+        # Check if quantity is a multiple of step size
+        if abs(round(quantity * m.inv_step) * m.step_size - quantity) > 1e-9 * max(1.0, quantity):
+            return False, f"Quantity {quantity} must be a multiple of step size {m.step_size}", m
+
+        return True, "", m
+
+    async def calculate_position_size(self, symbol: str, risk_pct: float, stop_loss: float = None) -> Optional[float]:
         """
         Calculate position size based on account balance and risk percentage
         
@@ -149,18 +273,19 @@ class EnhancedTradingBot:
             float: Recommended position size or None if calculation fails
         """
         try:
-            # Get account balance
-            account_info = self.get_account_info()
-            if not account_info:
-                return None
-                
-            # Find USDT balance
-            usdt_balance = None
-            for asset in account_info['assets']:
-                if asset['asset'] == 'USDT':
-                    usdt_balance = float(asset['walletBalance'])
-                    break
-                    
+            # Use the streamed balance, falling back to REST on a cold cache
+            usdt_balance = self.cache['USDT_balance']
+            if usdt_balance is None:
+                account_info = await self.get_account_info()
+                if not account_info:
+                    return None
+
+                # Find USDT balance
+                for asset in account_info['assets']:
+                    if asset['asset'] == 'USDT':
+                        usdt_balance = float(asset['walletBalance'])
+                        break
+
             if not usdt_balance:
                 logger.error("USDT balance not found")
                 return None
@@ -168,42 +293,54 @@ class EnhancedTradingBot:
             # Calculate risk amount
             risk_amount = usdt_balance * (risk_pct / 100)
             
-            # If no stop loss provided, just return the maximum quantity based on risk amount
-            if not stop_loss:
-                # Get current price to estimate position size
-                self._rate_limit()
-                ticker = self.client.futures_symbol_ticker(symbol=symbol)
-                current_price = float(ticker['price'])
-                
-                # Calculate position size based on risk amount
-                position_size = risk_amount / current_price
-                
-                # Validate against symbol constraints
-                is_valid, error_msg = self.validate_quantity(symbol, position_size)
-                if not is_valid:
-                    logger.warning(f"Calculated position size {position_size} is invalid: {error_msg}")
-                    
-                    # Adjust to nearest valid quantity
-                    symbol_info = self.get_symbol_info(symbol)
-                    for filter in symbol_info['filters']:
-                        if filter['filterType'] == 'LOT_SIZE':
-                            step_size = float(filter['stepSize'])
-                            position_size = round(position_size / step_size) * step_size
-                            position_size = max(min(position_size, float(filter['maxQty'])), float(filter['minQty']))
-                            break
-                
-                return position_size
-            
-            # If stop loss provided, calculate position size based on risk amount and stop distance
-            # This would require knowing the entry price and stop loss price to calculate the risk per unit
-            # For simplicity, we'll just return the basic calculation
-            return self.calculate_position_size(symbol, risk_pct)
+            return await self._size_from_balance(symbol, risk_amount, stop_loss)
             
         except Exception as e:
             logger.error(f"Error calculating position size: {e}")
             return None
 
-    def place_market_order(self, symbol: str, side: str, quantity: float) -> Optional[Dict]:
+    async def _size_from_balance(self, symbol: str, risk_amount: float,
+                                 stop_loss: float = None) -> float:
+        """
+        Turn a risk amount into a valid position size using one price lookup
+        
+        Args:
+            symbol (str): Trading symbol
+            risk_amount (float): Amount of USDT to risk
+            stop_loss (float): Stop loss price (optional)
+            
+        Returns:
+            float: Position size adjusted to the symbol's lot size
+        """
+        # Get current price to estimate position size
+        current_price = self.cache['price'].get(symbol)
+        if current_price is None:
+            ticker = await self._call(1, self.client.futures_symbol_ticker, symbol=symbol)
+            current_price = float(ticker['price'])
+
+        if stop_loss:
+            # Risk per unit is the distance from entry to the stop
+            stop_distance = abs(current_price - stop_loss)
+            if stop_distance == 0:
+                raise ValueError(f"Stop loss {stop_loss} equals the current price")
+            position_size = risk_amount / stop_distance
+        else:
+            # Without a stop, size the position so its notional equals the risk amount
+            position_size = risk_amount / current_price
+
+        # Validate against symbol constraints
+        is_valid, error_msg, m = await self._check_quantity(symbol, position_size)
+        if not is_valid:
+            logger.warning(f"Calculated position size {position_size} is invalid: {error_msg}")
+
+            # Adjust to nearest valid quantity using the metadata it was validated against
+            if m:
+                position_size = round(round(position_size * m.inv_step) * m.step_size, m.step_decimals)
+                position_size = max(min(position_size, m.max_qty), m.min_qty)
+
+        return position_size
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float) -> Optional[Dict]:
         """
         Place a market order
         
@@ -216,14 +353,14 @@ class EnhancedTradingBot:
             dict: Order response from Binance
         """
         try:
-            is_valid, error_msg = self.validate_quantity(symbol, quantity)
+            is_valid, error_msg = await self.validate_quantity(symbol, quantity)
             if not is_valid:
                 logger.error(f"Invalid quantity: {error_msg}")
                 return None
                 
             logger.info(f"Placing market order: {side} {quantity} {symbol}")
-            self._rate_limit()
-            order = self.client.futures_create_order(
+            order = await self._call(
+                1, self.client.futures_create_order, order=True,
                 symbol=symbol,
                 side=side,
                 type=Client.FUTURE_ORDER_TYPE_MARKET,
@@ -239,7 +376,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error placing market order: {e}")
         return None
 
-    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float, 
+    async def place_limit_order(self, symbol: str, side: str, quantity: float, price: float, 
                          time_in_force: str = Client.TIME_IN_FORCE_GTC) -> Optional[Dict]:
         """
         Place a limit order
@@ -255,14 +392,14 @@ class EnhancedTradingBot:
             dict: Order response from Binance
         """
         try:
-            is_valid, error_msg = self.validate_quantity(symbol, quantity)
+            is_valid, error_msg = await self.validate_quantity(symbol, quantity)
             if not is_valid:
                 logger.error(f"Invalid quantity: {error_msg}")
                 return None
                 
             logger.info(f"Placing limit order: {side} {quantity} {symbol} @ {price}")
-            self._rate_limit()
-            order = self.client.futures_create_order(
+            order = await self._call(
+                1, self.client.futures_create_order, order=True,
                 symbol=symbol,
                 side=side,
                 type=Client.FUTURE_ORDER_TYPE_LIMIT,
@@ -280,7 +417,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error placing limit order: {e}")
         return None
 
-    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, 
+    async def place_stop_limit_order(self, symbol: str, side: str, quantity: float, 
                               price: float, stop_price: float) -> Optional[Dict]:
         """
         Place a stop-limit order
@@ -296,14 +433,14 @@ class EnhancedTradingBot:
             dict: Order response from Binance
         """
         try:
-            is_valid, error_msg = self.validate_quantity(symbol, quantity)
+            is_valid, error_msg = await self.validate_quantity(symbol, quantity)
             if not is_valid:
                 logger.error(f"Invalid quantity: {error_msg}")
                 return None
                 
             logger.info(f"Placing stop-limit order: {side} {quantity} {symbol} @ {price} (stop: {stop_price})")
-            self._rate_limit()
-            order = self.client.futures_create_order(
+            order = await self._call(
+                1, self.client.futures_create_order, order=True,
                 symbol=symbol,
                 side=side,
                 type=Client.FUTURE_ORDER_TYPE_STOP,
@@ -322,7 +459,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error placing stop-limit order: {e}")
         return None
 
-    def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, 
+    async def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, 
                                  callback_rate: float, activation_price: float = None) -> Optional[Dict]:
         """
         Place a trailing stop order
@@ -338,7 +475,7 @@ class EnhancedTradingBot:
             dict: Order response from Binance
         """
         try:
-            is_valid, error_msg = self.validate_quantity(symbol, quantity)
+            is_valid, error_msg = await self.validate_quantity(symbol, quantity)
             if not is_valid:
                 logger.error(f"Invalid quantity: {error_msg}")
                 return None
@@ -355,8 +492,7 @@ class EnhancedTradingBot:
                 params['activationPrice'] = activation_price
                 
             logger.info(f"Placing trailing stop order: {side} {quantity} {symbol} @ {callback_rate}%")
-            self._rate_limit()
-            order = self.client.futures_create_order(**params)
+            order = await self._call(1, self.client.futures_create_order, order=True, **params)
             logger.info(f"Trailing stop order placed successfully: {order}")
             return order
         except BinanceAPIException as e:
@@ -367,7 +503,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error placing trailing stop order: {e}")
         return None
 
-    def place_oco_order(self, symbol: str, side: str, quantity: float, price: float, 
+    async def place_oco_order(self, symbol: str, side: str, quantity: float, price: float, 
                        stop_price: float, stop_limit_price: float) -> Optional[Dict]:
         """
         Place an OCO (One-Cancels-Other) order
@@ -384,14 +520,14 @@ class EnhancedTradingBot:
             dict: Order response from Binance
         """
         try:
-            is_valid, error_msg = self.validate_quantity(symbol, quantity)
+            is_valid, error_msg = await self.validate_quantity(symbol, quantity)
             if not is_valid:
                 logger.error(f"Invalid quantity: {error_msg}")
                 return None
                 
             logger.info(f"Placing OCO order: {side} {quantity} {symbol} @ {price} (stop: {stop_price})")
-            self._rate_limit()
-            order = self.client.futures_create_order(
+            order = await self._call(
+                1, self.client.futures_create_order, order=True,
                 symbol=symbol,
                 side=side,
                 quantity=quantity,
@@ -413,7 +549,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error placing OCO order: {e}")
         return None
 
-    def cancel_order(self, symbol: str, order_id: int) -> Optional[Dict]:
+    async def cancel_order(self, symbol: str, order_id: int) -> Optional[Dict]:
         """
         Cancel an open order
         
@@ -426,8 +562,7 @@ class EnhancedTradingBot:
         """
         try:
             logger.info(f"Cancelling order {order_id} on {symbol}")
-            self._rate_limit()
-            result = self.client.futures_cancel_order(symbol=symbol, orderId=order_id)
+            result = await self._call(1, self.client.futures_cancel_order, symbol=symbol, orderId=order_id)
             logger.info(f"Order cancelled successfully: {result}")
             return result
         except BinanceAPIException as e:
@@ -436,7 +571,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error cancelling order: {e}")
         return None
 
-    def get_order_status(self, symbol: str, order_id: int) -> Optional[Dict]:
+    async def get_order_status(self, symbol: str, order_id: int) -> Optional[Dict]:
         """
         Check the status of an order
         
@@ -449,8 +584,7 @@ class EnhancedTradingBot:
         """
         try:
             logger.info(f"Checking status for order {order_id} on {symbol}")
-            self._rate_limit()
-            status = self.client.futures_get_order(symbol=symbol, orderId=order_id)
+            status = await self._call(1, self.client.futures_get_order, symbol=symbol, orderId=order_id)
             logger.info(f"Order status: {status}")
             return status
         except BinanceAPIException as e:
@@ -459,7 +593,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error getting order status: {e}")
         return None
 
-    def get_open_orders(self, symbol: str = None) -> Optional[List[Dict]]:
+    async def get_open_orders(self, symbol: str = None) -> Optional[List[Dict]]:
         """
         Get all open orders or for a specific symbol
         
@@ -471,11 +605,10 @@ class EnhancedTradingBot:
         """
         try:
             logger.info(f"Fetching open orders for {symbol if symbol else 'all symbols'}")
-            self._rate_limit()
             if symbol:
-                orders = self.client.futures_get_open_orders(symbol=symbol)
+                orders = await self._call(1, self.client.futures_get_open_orders, symbol=symbol)
             else:
-                orders = self.client.futures_get_open_orders()
+                orders = await self._call(40, self.client.futures_get_open_orders)
             logger.info(f"Found {len(orders)} open orders")
             return orders
         except BinanceAPIException as e:
@@ -484,7 +617,7 @@ class EnhancedTradingBot:
             logger.error(f"Unexpected error getting open orders: {e}")
         return None
 
-    def get_historical_trades(self, symbol: str, limit: int = 100) -> Optional[List[Dict]]:
+    async def get_historical_trades(self, symbol: str, limit: int = 100) -> Optional[pd.DataFrame]:
         """
         Get historical trade data
         
@@ -493,21 +626,23 @@ class EnhancedTradingBot:
             limit (int): Number of trades to retrieve (default: 100)
             
         Returns:
-            list: Historical trades
+            pd.DataFrame: Historical trades with numeric price/qty columns and datetime time
         """
         try:
             logger.info(f"Fetching historical trades for {symbol}")
-            self._rate_limit()
-            trades = self.client.futures_historical_trades(symbol=symbol, limit=limit)
+            trades = await self._call(20, self.client.futures_historical_trades, symbol=symbol, limit=limit)
             logger.info(f"Retrieved {len(trades)} historical trades")
-            return trades
+            df = pd.DataFrame(trades, columns=['id', 'price', 'qty', 'quoteQty', 'time', 'isBuyerMaker'])
+            df = df.astype({'price': 'float64', 'qty': 'float64', 'quoteQty': 'float64'})
+            df['time'] = pd.to_datetime(df['time'], unit='ms')
+            return df
         except BinanceAPIException as e:
             logger.error(f"API error getting historical trades: {e}")
         except Exception as e:
             logger.error(f"Unexpected error getting historical trades: {e}")
         return None
 
-    def generate_report(self, symbol: str = None, days: int = 7) -> Optional[str]:
+    async def generate_report(self, symbol: str = None, days: int = 7) -> Optional[str]:
         """
         Generate a trading report
         
@@ -519,73 +654,73 @@ class EnhancedTradingBot:
             str: Formatted report
         """
         try:
-            # Get account information
-            account_info = self.get_account_info()
-            if not account_info:
+            # Fetch account info, positions and open orders concurrently
+            account_info, positions, orders = await asyncio.gather(
+                self.get_account_info(),
+                self.get_position_info(symbol),
+                self.get_open_orders(symbol),
+                return_exceptions=True
+            )
+
+            if isinstance(account_info, Exception) or not account_info:
+                if isinstance(account_info, Exception):
+                    logger.error(f"Error fetching account info for report: {account_info}")
                 return "Failed to generate report: Could not fetch account info"
-                
-            # Get positions
-            positions = self.get_position_info(symbol)
-            
-            # Get open orders
-            orders = self.get_open_orders(symbol)
-            
+
+            if isinstance(positions, Exception):
+                logger.error(f"Error fetching positions for report: {positions}")
+                positions = None
+
+            if isinstance(orders, Exception):
+                logger.error(f"Error fetching open orders for report: {orders}")
+                orders = None
+
             # Format report
-            report = []
-            report.append("=" * 60)
-            report.append("TRADING BOT REPORT")
-            report.append("=" * 60)
-            report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            report.append(f"Account Balance: {account_info.get('totalWalletBalance', 'N/A')} USDT")
-            report.append(f"Account Equity: {account_info.get('totalMarginBalance', 'N/A')} USDT")
-            report.append("")
-            
+            report = io.StringIO()
+            report.write("=" * 60 + "\n")
+            report.write("TRADING BOT REPORT\n")
+            report.write("=" * 60 + "\n")
+            report.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            report.write(f"Account Balance: {account_info.get('totalWalletBalance', 'N/A')} USDT\n")
+            report.write(f"Account Equity: {account_info.get('totalMarginBalance', 'N/A')} USDT\n")
+            report.write("\n")
+
             if positions:
-                report.append("POSITIONS:")
-                pos_data = []
-                for pos in positions:
-                    if float(pos['positionAmt']) != 0:
-                        pos_data.append([
-                            pos['symbol'],
-                            pos['positionAmt'],
-                            pos['entryPrice'],
-                            pos['unRealizedProfit'],
-                            pos['leverage']
-                        ])
-                
-                if pos_data:
-                    from tabulate import tabulate
-                    report.append(tabulate(pos_data, 
-                                         headers=['Symbol', 'Amount', 'Entry Price', 'P&L', 'Leverage'],
-                                         tablefmt='grid'))
+                report.write("POSITIONS:\n")
+                df_pos = pd.DataFrame(
+                    positions,
+                    columns=['symbol', 'positionAmt', 'entryPrice', 'unRealizedProfit', 'leverage']
+                )
+                df_pos['positionAmt'] = df_pos['positionAmt'].astype(float)
+                df_pos = df_pos[df_pos['positionAmt'] != 0]
+
+                if not df_pos.empty:
+                    report.write(tabulate(df_pos.values.tolist(),
+                                          headers=['Symbol', 'Amount', 'Entry Price', 'P&L', 'Leverage'],
+                                          tablefmt='grid'))
+                    report.write("\n")
                 else:
-                    report.append("No open positions")
-            report.append("")
-            
+                    report.write("No open positions\n")
+            report.write("\n")
+
             if orders:
-                report.append("OPEN ORDERS:")
-                order_data = []
-                for order in orders:
-                    order_data.append([
-                        order['symbol'],
-                        order['side'],
-                        order['type'],
-                        order['origQty'],
-                        order.get('price', 'N/A'),
-                        order['status']
-                    ])
-                
-                from tabulate import tabulate
-                report.append(tabulate(order_data,
-                                     headers=['Symbol', 'Side', 'Type', 'Quantity', 'Price', 'Status'],
-                                     tablefmt='grid'))
+                report.write("OPEN ORDERS:\n")
+                df_orders = pd.DataFrame(
+                    orders,
+                    columns=['symbol', 'side', 'type', 'origQty', 'price', 'status']
+                )
+                df_orders['price'] = df_orders['price'].fillna('N/A')
+                report.write(tabulate(df_orders.values.tolist(),
+                                      headers=['Symbol', 'Side', 'Type', 'Quantity', 'Price', 'Status'],
+                                      tablefmt='grid'))
+                report.write("\n")
             else:
-                report.append("No open orders")
-                
-            report.append("")
-            report.append("=" * 60)
-            
-            return "\n".join(report)
+                report.write("No open orders\n")
+
+            report.write("\n")
+            report.write("=" * 60)
+
+            return report.getvalue()
             
         except Exception as e:
             logger.error(f"Error generating report: {e}")
@@ -5,16 +5,42 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+from contextlib import asynccontextmanager
 import json
 import logging
 import asyncio
+import os
+import dotenv
 from datetime import datetime
 
 from app.routers import orders, account, ws
-from app.bot import EnhancedTradingBot
+from app.bot import EnhancedTradingBot, log_listener
+from app.binance_async import create_session
+from app.streams import BotStreams
+
+dotenv.load_dotenv()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener.start()
+
+    # Single shared HTTP session and bot instance for the whole application
+    api_key = os.getenv("binance_api_key")
+    api_secret = os.getenv("binance_secret_key")
+    app.state.session = create_session()
+    app.state.bot = EnhancedTradingBot(api_key, api_secret, app.state.session, testnet=True)
+    app.state.streams = BotStreams(app.state.bot)
+    await app.state.streams.start(api_key, api_secret, testnet=True)
+    yield
+    await app.state.streams.stop()
+    await ws.manager.close_binance_client()
+    await app.state.session.close()
+    log_listener.stop()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="CryptoTrader Pro", version="1.0.0")
+app = FastAPI(title="CryptoTrader Pro", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -37,18 +63,6 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 async def read_index():
     return FileResponse("app/static/index.html")
 
-# Global bot instance (in production, use proper dependency injection)
-bot_instance = None
-
-def get_bot():
-    global bot_instance
-    if bot_instance is None:
-        # Initialize with environment variables or config
-        api_key = "your_testnet_api_key"
-        api_secret = "your_testnet_api_secret"
-        bot_instance = EnhancedTradingBot(api_key, api_secret, testnet=True)
-    return bot_instance
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialize a token bucket rate limiter
+
+        Args:
+            capacity (float): Maximum number of tokens the bucket can hold
+            rate (float): Tokens added per second
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def drain_for(self, seconds: float):
+        """Empty the bucket and pause refilling for `seconds` (e.g. after a 429)"""
+        self.tokens = 0
+        self.last_refill = max(self.last_refill, time.monotonic() + seconds)
+
+    def _refill(self):
+        now = time.monotonic()
+        if now > self.last_refill:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+    async def acquire(self, cost: float = 1):
+        """Wait until `cost` tokens are available, then consume them"""
+        cost = min(cost, self.capacity)
+        while True:
+            paused = self.last_refill - time.monotonic()
+            if paused > 0:
+                await asyncio.sleep(paused)
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return
+            needed = cost - self.tokens
+            await asyncio.sleep(needed / self.rate)
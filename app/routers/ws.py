@@ -1,12 +1,15 @@
 # app/routers/ws.py
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict, Optional
+from typing import Dict, List, Optional, Set, Union
 import json
 import asyncio
 import logging
+import aiohttp
+import orjson
+import ormsgpack
 from binance import AsyncClient, BinanceSocketManager
 from binance.exceptions import BinanceAPIException
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 import os
 
@@ -17,47 +20,257 @@ logger = logging.getLogger("WebSocketManager")
 router = APIRouter()
 
 
+# Binance sends these messages with a fixed shape, so they are rendered straight
+# to JSON. Every value is a plain symbol, interval or decimal string (no escaping).
+TICKER_TEMPLATE = (
+    '{"type":"ticker","symbol":"%s","price":"%s","price_change":"%s",'
+    '"price_change_percent":"%s","high":"%s","low":"%s","volume":"%s",'
+    '"quote_volume":"%s","timestamp":%d,"event_time":"%s"}'
+)
+KLINE_TEMPLATE = (
+    '{"type":"kline","symbol":"%s","interval":"%s","open":"%s","high":"%s",'
+    '"low":"%s","close":"%s","volume":"%s","is_closed":%s,"event_time":%d,'
+    '"start_time":%d,"end_time":%d}'
+)
+
+
+_iso_cache: Dict[int, str] = {}
+
+
+def _iso(ms: int) -> str:
+    """UTC ISO timestamp for an epoch-millisecond time, cached per second across all streams"""
+    seconds = ms // 1000
+    value = _iso_cache.get(seconds)
+    if value is None:
+        if len(_iso_cache) >= 4096:
+            _iso_cache.clear()
+        value = _iso_cache[seconds] = datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+
+def _merge_json(batch: List[bytes]) -> bytes:
+    return b"[" + b",".join(batch) + b"]"
+
+
+def _merge_msgpack(batch: List[bytes]) -> bytes:
+    """Wrap already packed items in a msgpack array header"""
+    count = len(batch)
+    if count < 16:
+        header = bytes((0x90 | count,))
+    elif count < 0x10000:
+        header = b"\xdc" + count.to_bytes(2, "big")
+    else:
+        header = b"\xdd" + count.to_bytes(4, "big")
+    return header + b"".join(batch)
+
+
 class ConnectionManager:
+    QUEUE_SIZE = 1000
+    SEND_TIMEOUT = 5.0
+    MAX_CONCURRENT_SENDS = 100
+    DEPTH_FLUSH_INTERVAL = 0.02
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.binance_client: Optional[AsyncClient] = None
         self.bm: Optional[BinanceSocketManager] = None
-        self.socket_tasks = {}
-        self.symbol_subscriptions = {}
-        self.running_streams = set()
+        self.socket_tasks: Dict[str, asyncio.Task] = {}
+        self.symbol_subscriptions: Dict[str, Set[WebSocket]] = {}
+        self.send_semaphore: Optional[asyncio.Semaphore] = None
+        self._init_lock: Optional[asyncio.Lock] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if self.send_semaphore is None:
+            # Created lazily so it belongs to the server's running event loop
+            self.send_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
+        # JSON in binary frames by default; ?format=text for clients that only handle
+        # text frames, ?format=msgpack for clients that want MessagePack
+        frame_format = websocket.query_params.get("format")
+        websocket._text_frames = frame_format == "text"
+        websocket._msgpack = frame_format == "msgpack"
+        websocket._encoder = ormsgpack.packb if websocket._msgpack else orjson.dumps
+        # Outgoing messages are queued and written by a dedicated task per client
+        websocket._out_q = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        websocket._writer = asyncio.create_task(self._writer_loop(websocket))
+        # Set once the writer has given up on the connection, so the endpoint can exit
+        websocket._closed = asyncio.Event()
+        # Streams owned by this client, keyed like "ticker_BTCUSDT"
+        websocket._streams = set()
+        websocket._tasks = {}
+        # Shared upstream streams this client is subscribed to
+        websocket._subscriptions = set()
+        self.active_connections.add(websocket)
         logger.info(f"New WebSocket connection. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        for stream_key in list(getattr(websocket, "_subscriptions", ())):
+            self.unsubscribe(websocket, stream_key)
+        writer = getattr(websocket, "_writer", None)
+        if writer and writer is not asyncio.current_task():
+            writer.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
-
-    async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
+    def enqueue(self, websocket: WebSocket, payload: bytes):
+        """Queue a serialized payload for the client, dropping the oldest one if full"""
+        queue = websocket._out_q
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+        queue.put_nowait(payload)
+
+    async def _writer_loop(self, websocket: WebSocket):
+        """Send queued payloads, merging everything pending into a single frame"""
+        queue = websocket._out_q
+        text_frames = websocket._text_frames
+        merge = _merge_msgpack if websocket._msgpack else _merge_json
+        while True:
+            batch = [await queue.get()]
+            while True:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            payload = batch[0] if len(batch) == 1 else merge(batch)
+            # Hand the encoded bytes straight to the ASGI server
+            if text_frames:
+                message = {"type": "websocket.send", "text": payload.decode()}
+            else:
+                message = {"type": "websocket.send", "bytes": payload}
             try:
-                await connection.send_json(message)
+                async with self.send_semaphore:
+                    await asyncio.wait_for(websocket.send(message), timeout=self.SEND_TIMEOUT)
             except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
-                disconnected.append(connection)
-        
-        for connection in disconnected:
-            self.disconnect(connection)
+                logger.error(f"Error sending to connection: {e}")
+                self.stop_stream(websocket)
+                self.disconnect(websocket)
+                try:
+                    await asyncio.wait_for(websocket.close(code=1011), timeout=self.SEND_TIMEOUT)
+                except Exception:
+                    pass  # The transport is most likely gone already
+                websocket._closed.set()
+                return
+            for _ in batch:
+                queue.task_done()
+
+    async def send_personal_message(self, message: dict, websocket: WebSocket):
+        self.enqueue(websocket, websocket._encoder(message))
+
+    def send_payload(self, websocket: WebSocket, payload: bytes):
+        """Queue an already serialized JSON payload, re-encoding it for msgpack clients"""
+        if websocket._msgpack:
+            payload = ormsgpack.packb(orjson.loads(payload))
+        self.enqueue(websocket, payload)
+
+    async def broadcast(self, message: Union[dict, list, bytes], connections: Optional[Set[WebSocket]] = None):
+        """Send a message to the given connections (default: all), encoding it once per format"""
+        if isinstance(message, bytes):
+            await self.broadcast_bytes(message, connections)
+            return
+        targets = self.active_connections if connections is None else connections
+        json_payload = msgpack_payload = None
+        for connection in targets:
+            if connection._msgpack:
+                if msgpack_payload is None:
+                    msgpack_payload = ormsgpack.packb(message)
+                self.enqueue(connection, msgpack_payload)
+            else:
+                if json_payload is None:
+                    json_payload = orjson.dumps(message)
+                self.enqueue(connection, json_payload)
+
+    async def broadcast_bytes(self, payload: bytes, connections: Optional[Set[WebSocket]] = None):
+        """Send an already serialized JSON payload to the given connections (default: all)"""
+        targets = self.active_connections if connections is None else connections
+        msgpack_payload = None
+        for connection in targets:
+            if connection._msgpack:
+                if msgpack_payload is None:
+                    msgpack_payload = ormsgpack.packb(orjson.loads(payload))
+                self.enqueue(connection, msgpack_payload)
+            else:
+                self.enqueue(connection, payload)
+
+    async def wait_for_disconnect(self, websocket: WebSocket):
+        """Block until the client closes the connection"""
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    async def receive_text(self, websocket: WebSocket, timeout: float) -> str:
+        """Receive a text message, raising WebSocketDisconnect if the connection was closed on our side"""
+        receive = asyncio.ensure_future(websocket.receive_text())
+        closed = asyncio.ensure_future(websocket._closed.wait())
+        try:
+            done, _ = await asyncio.wait([receive, closed], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+        if receive in done:
+            return receive.result()
+        receive.cancel()
+        if closed in done:
+            raise WebSocketDisconnect(code=1011)
+        raise asyncio.TimeoutError
+
+    async def wait_for_stream(self, websocket: WebSocket, task: asyncio.Task):
+        """Wait for a stream task to finish (or the client to leave), then flush anything queued"""
+        disconnected = asyncio.create_task(self.wait_for_disconnect(websocket))
+        closed = asyncio.create_task(websocket._closed.wait())
+        try:
+            await asyncio.wait([task, disconnected, closed], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnected.cancel()
+            closed.cancel()
+        if not task.done() or websocket._closed.is_set():
+            return
+        try:
+            await asyncio.wait_for(websocket._out_q.join(), timeout=self.SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out flushing messages to closing connection")
+
+    @staticmethod
+    def stream_key(stream_type: str, symbol: Optional[str] = None) -> str:
+        return f"{stream_type}_{symbol}" if symbol else stream_type
+
+    def start_stream(self, websocket: WebSocket, stream_key: str, coro) -> asyncio.Task:
+        """Run a stream coroutine as a task owned by the websocket (once per key)"""
+        if stream_key in websocket._streams:
+            coro.close()
+            return websocket._tasks[stream_key]
+
+        task = asyncio.create_task(coro)
+        websocket._streams.add(stream_key)
+        websocket._tasks[stream_key] = task
+
+        def forget(done: asyncio.Task):
+            if websocket._tasks.get(stream_key) is done:
+                websocket._streams.discard(stream_key)
+                del websocket._tasks[stream_key]
+
+        task.add_done_callback(forget)
+        return task
+
+    def subscribe(self, websocket: WebSocket, stream_key: str, run) -> asyncio.Task:
+        """Add a websocket to a shared upstream stream, starting it for the first subscriber"""
+        self.symbol_subscriptions.setdefault(stream_key, set()).add(websocket)
+        websocket._subscriptions.add(stream_key)
+        task = self.socket_tasks.get(stream_key)
+        if task is None or task.done():
+            task = self.socket_tasks[stream_key] = asyncio.create_task(run())
+        return task
 
     async def initialize_binance_client(self):
-        """Initialize the Binance async client"""
-        if self.binance_client is None:
+        """Initialize the Binance async client shared by every stream"""
+        if self.binance_client is not None:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            # Another stream may have created the client while we waited
+            if self.binance_client is not None:
+                return
             try:
                 # Get credentials from environment variables
                 api_key = os.getenv("binance_api_key", "your_testnet_api_key")
@@ -66,7 +279,9 @@ class ConnectionManager:
                 self.binance_client = await AsyncClient.create(
                     api_key=api_key, 
                     api_secret=api_secret, 
-                    testnet=True
+                    testnet=True,
+                    # Keep REST connections warm across stream reconnects
+                    session_params={"connector": aiohttp.TCPConnector(limit=50, keepalive_timeout=75)}
                 )
                 self.bm = BinanceSocketManager(self.binance_client, user_timeout=60)
                 logger.info("Binance WebSocket client initialized")
@@ -76,101 +291,95 @@ class ConnectionManager:
 
     async def close_binance_client(self):
         """Close the Binance client"""
+        for task in self.socket_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.socket_tasks.values(), return_exceptions=True)
+        self.socket_tasks.clear()
         if self.binance_client:
             await self.binance_client.close_connection()
             self.binance_client = None
             self.bm = None
             logger.info("Binance WebSocket client closed")
 
-    async def handle_ticker_stream(self, symbol: str, websocket: WebSocket):
-        """Handle individual ticker stream for a symbol"""
-        stream_key = f"ticker_{symbol}_{id(websocket)}"
-        if stream_key in self.running_streams:
-            return
-            
+    async def handle_ticker_stream(self, symbol: str, websocket: WebSocket) -> asyncio.Task:
+        """Subscribe a websocket to the shared ticker stream for a symbol"""
+        stream_key = self.stream_key("ticker", symbol)
+        return self.subscribe(websocket, stream_key, lambda: self.run_ticker_stream(symbol, stream_key))
+
+    async def run_ticker_stream(self, symbol: str, stream_key: str):
+        """Read the ticker stream for a symbol once and fan it out to every subscriber"""
+        subscribers = self.symbol_subscriptions.setdefault(stream_key, set())
         try:
             await self.initialize_binance_client()
-            self.running_streams.add(stream_key)
             
             # Use the correct method name for futures ticker socket
             async with self.bm.symbol_ticker_socket(symbol) as stream:
                 logger.info(f"Started ticker stream for {symbol}")
-                while stream_key in self.running_streams:
-                    try:
+                try:
+                    while True:
                         res = await stream.recv()
                         if res and res.get('e') != 'error':
-                            ticker_data = {
-                                "type": "ticker",
-                                "symbol": res['s'],
-                                "price": float(res['c']),
-                                "price_change": float(res['p']),
-                                "price_change_percent": float(res['P']),
-                                "high": float(res['h']),
-                                "low": float(res['l']),
-                                "volume": float(res['v']),
-                                "quote_volume": float(res['q']),
-                                "timestamp": res['E'],
-                                "event_time": datetime.fromtimestamp(res['E'] / 1000).isoformat()
-                            }
-                            await self.send_personal_message(ticker_data, websocket)
+                            payload = TICKER_TEMPLATE % (
+                                res['s'], res['c'], res['p'], res['P'], res['h'], res['l'],
+                                res['v'], res['q'], res['E'], _iso(res['E'])
+                            )
+                            await self.broadcast_bytes(payload.encode(), subscribers)
                         elif res and res.get('e') == 'error':
                             logger.error(f"Socket error for {symbol}: {res}")
                             break
-                    except Exception as e:
-                        logger.error(f"Error in ticker stream for {symbol}: {e}")
-                        break
+                except Exception as e:
+                    logger.error(f"Error in ticker stream for {symbol}: {e}")
+        except asyncio.CancelledError:
+            logger.info(f"Stopped ticker stream for {symbol}")
+            raise
         except BinanceAPIException as e:
             logger.error(f"Binance API exception in ticker stream for {symbol}: {e}")
             error_msg = {"type": "error", "message": f"API error for {symbol}: {str(e)}"}
-            await self.send_personal_message(error_msg, websocket)
+            await self.broadcast(error_msg, subscribers)
         except Exception as e:
             logger.error(f"Failed to handle ticker stream for {symbol}: {e}")
             error_msg = {"type": "error", "message": f"Failed to subscribe to {symbol}: {str(e)}"}
-            await self.send_personal_message(error_msg, websocket)
-        finally:
-            self.running_streams.discard(stream_key)
+            await self.broadcast(error_msg, subscribers)
 
-    async def handle_mini_ticker_stream(self, websocket: WebSocket):
-        """Handle mini ticker stream for all symbols"""
-        stream_key = f"mini_ticker_{id(websocket)}"
-        if stream_key in self.running_streams:
-            return
-            
+    async def handle_mini_ticker_stream(self, websocket: WebSocket) -> asyncio.Task:
+        """Subscribe a websocket to the shared mini ticker stream for all symbols"""
+        return self.subscribe(websocket, "mini_ticker", self.run_mini_ticker_stream)
+
+    async def run_mini_ticker_stream(self):
+        """Read the mini ticker stream once and fan it out to every subscriber"""
+        subscribers = self.symbol_subscriptions.setdefault("mini_ticker", set())
         try:
             await self.initialize_binance_client()
-            self.running_streams.add(stream_key)
             
             # Use the updated method name
             async with self.bm.all_mini_ticker_socket() as stream:
                 logger.info("Started mini ticker stream for all symbols")
-                while stream_key in self.running_streams:
-                    try:
+                try:
+                    while True:
                         res = await stream.recv()
-                        if res and res.get('e') != 'error':
-                            if isinstance(res, list):
-                                for item in res:
-                                    mini_ticker_data = self.format_mini_ticker_data(item)
-                                    await self.send_personal_message(mini_ticker_data, websocket)
-                            else:
-                                mini_ticker_data = self.format_mini_ticker_data(res)
-                                await self.send_personal_message(mini_ticker_data, websocket)
+                        if res and isinstance(res, list):
+                            # One frame per update, serialized once per format for all subscribers
+                            batch = [self.format_mini_ticker_data(item) for item in res]
+                            await self.broadcast(batch, subscribers)
+                        elif res and res.get('e') != 'error':
+                            await self.broadcast(self.format_mini_ticker_data(res), subscribers)
                         elif res and res.get('e') == 'error':
                             logger.error(f"Socket error in mini ticker: {res}")
                             break
-                    except Exception as e:
-                        logger.error(f"Error in mini ticker stream: {e}")
-                        break
+                except Exception as e:
+                    logger.error(f"Error in mini ticker stream: {e}")
                         
         except BinanceAPIException as e:
             logger.error(f"Binance API exception in mini ticker stream: {e}")
             error_msg = {"type": "error", "message": f"API error in mini ticker: {str(e)}"}
-            await self.send_personal_message(error_msg, websocket)
+            await self.broadcast(error_msg, subscribers)
         except Exception as e:
             logger.error(f"Failed to handle mini ticker stream: {e}")
             # Fallback to individual symbols
-            await self.fallback_mini_ticker(websocket)
+            for websocket in list(subscribers):
+                await self.fallback_mini_ticker(websocket)
         finally:
-            self.running_streams.discard(stream_key)
+            logger.info("Mini ticker stream stopped")
 
     def format_mini_ticker_data(self, res):
         """Format mini ticker data"""
@@ -178,14 +387,14 @@ class ConnectionManager:
             return {
                 "type": "mini_ticker",
                 "symbol": res['s'],
-                "price": float(res['c']),
-                "open": float(res['o']),
-                "high": float(res['h']),
-                "low": float(res['l']),
-                "volume": float(res['v']),
-                "quote_volume": float(res['q']),
+                "price": res['c'],
+                "open": res['o'],
+                "high": res['h'],
+                "low": res['l'],
+                "volume": res['v'],
+                "quote_volume": res['q'],
                 "timestamp": res['E'],
-                "event_time": datetime.fromtimestamp(res['E'] / 1000).isoformat()
+                "event_time": _iso(res['E'])
             }
         except (KeyError, ValueError) as e:
             logger.error(f"Error formatting mini ticker data: {e}")
@@ -196,22 +405,22 @@ class ConnectionManager:
         top_symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'XRPUSDT', 'SOLUSDT']
         
         for symbol in top_symbols:
-            asyncio.create_task(self.handle_ticker_stream(symbol, websocket))
+            await self.handle_ticker_stream(symbol, websocket)
+
+    async def handle_user_data_stream(self, websocket: WebSocket) -> asyncio.Task:
+        """Subscribe a websocket to the user data stream"""
+        stream_key = self.stream_key("user_data")
+        return self.start_stream(websocket, stream_key, self.run_user_data_stream(websocket))
 
-    async def handle_user_data_stream(self, websocket: WebSocket):
+    async def run_user_data_stream(self, websocket: WebSocket):
         """Handle user data stream (account updates, order updates)"""
-        stream_key = f"user_data_{id(websocket)}"
-        if stream_key in self.running_streams:
-            return
-            
         try:
             await self.initialize_binance_client()
-            self.running_streams.add(stream_key)
             
             async with self.bm.user_socket() as stream:
                 logger.info("Started user data stream")
-                while stream_key in self.running_streams:
-                    try:
+                try:
+                    while True:
                         res = await stream.recv()
                         if res and res.get('e') != 'error':
                             user_data = {
@@ -224,9 +433,11 @@ class ConnectionManager:
                         elif res and res.get('e') == 'error':
                             logger.error(f"Socket error in user data: {res}")
                             break
-                    except Exception as e:
-                        logger.error(f"Error in user data stream: {e}")
-                        break
+                except Exception as e:
+                    logger.error(f"Error in user data stream: {e}")
+        except asyncio.CancelledError:
+            logger.info("Stopped user data stream")
+            raise
         except BinanceAPIException as e:
             logger.error(f"Binance API exception in user data stream: {e}")
             error_msg = {"type": "error", "message": f"API error in user data: {str(e)}"}
@@ -235,47 +446,38 @@ class ConnectionManager:
             logger.error(f"Failed to handle user data stream: {e}")
             error_msg = {"type": "error", "message": f"Failed to start user data stream: {str(e)}"}
             await self.send_personal_message(error_msg, websocket)
-        finally:
-            self.running_streams.discard(stream_key)
 
-    async def handle_kline_stream(self, symbol: str, interval: str, websocket: WebSocket):
+    async def handle_kline_stream(self, symbol: str, interval: str, websocket: WebSocket) -> asyncio.Task:
+        """Subscribe a websocket to the kline stream for a symbol"""
+        stream_key = self.stream_key("kline", f"{symbol}_{interval}")
+        return self.start_stream(websocket, stream_key, self.run_kline_stream(symbol, interval, websocket))
+
+    async def run_kline_stream(self, symbol: str, interval: str, websocket: WebSocket):
         """Handle kline/candlestick stream"""
-        stream_key = f"kline_{symbol}_{interval}_{id(websocket)}"
-        if stream_key in self.running_streams:
-            return
-            
         try:
             await self.initialize_binance_client()
-            self.running_streams.add(stream_key)
             
             async with self.bm.kline_socket(symbol, interval) as stream:
                 logger.info(f"Started kline stream for {symbol} with interval {interval}")
-                while stream_key in self.running_streams:
-                    try:
+                try:
+                    while True:
                         res = await stream.recv()
                         if res and res.get('e') != 'error':
                             kline = res['k']
-                            kline_data = {
-                                "type": "kline",
-                                "symbol": kline['s'],
-                                "interval": kline['i'],
-                                "open": float(kline['o']),
-                                "high": float(kline['h']),
-                                "low": float(kline['l']),
-                                "close": float(kline['c']),
-                                "volume": float(kline['v']),
-                                "is_closed": kline['x'],
-                                "event_time": kline['T'],
-                                "start_time": kline['t'],
-                                "end_time": kline['T']
-                            }
-                            await self.send_personal_message(kline_data, websocket)
+                            payload = KLINE_TEMPLATE % (
+                                kline['s'], kline['i'], kline['o'], kline['h'], kline['l'],
+                                kline['c'], kline['v'], 'true' if kline['x'] else 'false',
+                                kline['T'], kline['t'], kline['T']
+                            )
+                            self.send_payload(websocket, payload.encode())
                         elif res and res.get('e') == 'error':
                             logger.error(f"Socket error for {symbol} kline: {res}")
                             break
-                    except Exception as e:
-                        logger.error(f"Error in kline stream for {symbol}: {e}")
-                        break
+                except Exception as e:
+                    logger.error(f"Error in kline stream for {symbol}: {e}")
+        except asyncio.CancelledError:
+            logger.info(f"Stopped kline stream for {symbol}")
+            raise
         except BinanceAPIException as e:
             logger.error(f"Binance API exception in kline stream for {symbol}: {e}")
             error_msg = {"type": "error", "message": f"API error for {symbol} kline: {str(e)}"}
@@ -284,39 +486,35 @@ class ConnectionManager:
             logger.error(f"Failed to handle kline stream for {symbol}: {e}")
             error_msg = {"type": "error", "message": f"Failed to subscribe to kline for {symbol}: {str(e)}"}
             await self.send_personal_message(error_msg, websocket)
-        finally:
-            self.running_streams.discard(stream_key)
 
-    async def handle_depth_stream(self, symbol: str, websocket: WebSocket):
+    async def handle_depth_stream(self, symbol: str, websocket: WebSocket) -> asyncio.Task:
+        """Subscribe a websocket to the order book depth stream for a symbol"""
+        stream_key = self.stream_key("depth", symbol)
+        return self.start_stream(websocket, stream_key, self.run_depth_stream(symbol, websocket))
+
+    async def run_depth_stream(self, symbol: str, websocket: WebSocket):
         """Handle order book depth stream"""
-        stream_key = f"depth_{symbol}_{id(websocket)}"
-        if stream_key in self.running_streams:
-            return
-            
+        pending = {}
+        flusher = None
         try:
             await self.initialize_binance_client()
-            self.running_streams.add(stream_key)
             
             async with self.bm.depth_socket(symbol) as stream:
                 logger.info(f"Started depth stream for {symbol}")
-                while stream_key in self.running_streams:
-                    try:
+                flusher = asyncio.create_task(self._depth_flusher(websocket, pending))
+                try:
+                    while True:
                         res = await stream.recv()
                         if res and res.get('e') != 'error':
-                            depth_data = {
-                                "type": "depth",
-                                "symbol": res['s'],
-                                "event_time": res['E'],
-                                "bids": [[float(price), float(quantity)] for price, quantity in res['b']],
-                                "asks": [[float(price), float(quantity)] for price, quantity in res['a']]
-                            }
-                            await self.send_personal_message(depth_data, websocket)
+                            self.merge_depth(pending, res)
                         elif res and res.get('e') == 'error':
                             logger.error(f"Socket error for {symbol} depth: {res}")
                             break
-                    except Exception as e:
-                        logger.error(f"Error in depth stream for {symbol}: {e}")
-                        break
+                except Exception as e:
+                    logger.error(f"Error in depth stream for {symbol}: {e}")
+        except asyncio.CancelledError:
+            logger.info(f"Stopped depth stream for {symbol}")
+            raise
         except BinanceAPIException as e:
             logger.error(f"Binance API exception in depth stream for {symbol}: {e}")
             error_msg = {"type": "error", "message": f"API error for {symbol} depth: {str(e)}"}
@@ -326,19 +524,69 @@ class ConnectionManager:
             error_msg = {"type": "error", "message": f"Failed to subscribe to depth for {symbol}: {str(e)}"}
             await self.send_personal_message(error_msg, websocket)
         finally:
-            self.running_streams.discard(stream_key)
+            if flusher:
+                flusher.cancel()
+                self.flush_depth(websocket, pending)
+
+    @staticmethod
+    def merge_depth(pending: dict, res: dict):
+        """Fold a depth diff into the pending update, keeping the latest quantity per price"""
+        if not pending:
+            # A lone diff is forwarded with Binance's own [price, qty] lists untouched
+            pending.update(type="depth", symbol=res['s'], event_time=res['E'], bids=res['b'], asks=res['a'])
+            return
+        pending['event_time'] = res['E']
+        for side, key in (('bids', 'b'), ('asks', 'a')):
+            levels = pending[side]
+            if isinstance(levels, list):
+                levels = pending[side] = dict(levels)
+            levels.update(res[key])
+
+    def flush_depth(self, websocket: WebSocket, pending: dict):
+        """Queue the merged depth update, if any, as one message"""
+        if not pending:
+            return
+        depth_data = dict(pending)
+        for side in ('bids', 'asks'):
+            if isinstance(depth_data[side], dict):
+                depth_data[side] = list(depth_data[side].items())
+        pending.clear()
+        self.enqueue(websocket, websocket._encoder(depth_data))
+
+    async def _depth_flusher(self, websocket: WebSocket, pending: dict):
+        while True:
+            await asyncio.sleep(self.DEPTH_FLUSH_INTERVAL)
+            self.flush_depth(websocket, pending)
 
     def stop_stream(self, websocket: WebSocket, stream_type: str = None, symbol: str = None):
         """Stop specific streams for a websocket"""
-        if stream_type and symbol:
-            stream_key = f"{stream_type}_{symbol}_{id(websocket)}"
-            self.running_streams.discard(stream_key)
+        if stream_type:
+            stream_key = self.stream_key(stream_type, symbol)
+            if stream_key in websocket._subscriptions:
+                self.unsubscribe(websocket, stream_key)
+            websocket._streams.discard(stream_key)
+            task = websocket._tasks.pop(stream_key, None)
+            if task:
+                task.cancel()
         else:
             # Stop all streams for this websocket
-            websocket_id = id(websocket)
-            keys_to_remove = [key for key in self.running_streams if key.endswith(f"_{websocket_id}")]
-            for key in keys_to_remove:
-                self.running_streams.discard(key)
+            for task in websocket._tasks.values():
+                task.cancel()
+            websocket._streams.clear()
+            websocket._tasks.clear()
+
+    def unsubscribe(self, websocket: WebSocket, stream_key: str):
+        """Remove a websocket from a shared stream, stopping it after the last subscriber"""
+        websocket._subscriptions.discard(stream_key)
+        subscribers = self.symbol_subscriptions.get(stream_key)
+        if subscribers is None:
+            return
+        subscribers.discard(websocket)
+        if not subscribers:
+            del self.symbol_subscriptions[stream_key]
+            task = self.socket_tasks.pop(stream_key, None)
+            if task:
+                task.cancel()
 
 
 manager = ConnectionManager()
@@ -349,7 +597,8 @@ async def symbol_ticker_websocket(websocket: WebSocket, symbol: str):
     """WebSocket endpoint for individual symbol ticker"""
     await manager.connect(websocket)
     try:
-        await manager.handle_ticker_stream(symbol.upper(), websocket)
+        task = await manager.handle_ticker_stream(symbol.upper(), websocket)
+        await manager.wait_for_stream(websocket, task)
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for ticker {symbol}")
     except Exception as e:
@@ -364,7 +613,8 @@ async def mini_ticker_websocket(websocket: WebSocket):
     """WebSocket endpoint for all symbols mini ticker"""
     await manager.connect(websocket)
     try:
-        await manager.handle_mini_ticker_stream(websocket)
+        task = await manager.handle_mini_ticker_stream(websocket)
+        await manager.wait_for_stream(websocket, task)
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected for mini ticker")
     except Exception as e:
@@ -379,7 +629,8 @@ async def user_data_websocket(websocket: WebSocket):
     """WebSocket endpoint for user data (account and order updates)"""
     await manager.connect(websocket)
     try:
-        await manager.handle_user_data_stream(websocket)
+        task = await manager.handle_user_data_stream(websocket)
+        await manager.wait_for_stream(websocket, task)
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected for user data")
     except Exception as e:
@@ -394,7 +645,8 @@ async def kline_websocket(websocket: WebSocket, symbol: str, interval: str):
     """WebSocket endpoint for kline/candlestick data"""
     await manager.connect(websocket)
     try:
-        await manager.handle_kline_stream(symbol.upper(), interval, websocket)
+        task = await manager.handle_kline_stream(symbol.upper(), interval, websocket)
+        await manager.wait_for_stream(websocket, task)
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for kline {symbol}")
     except Exception as e:
@@ -409,7 +661,8 @@ async def depth_websocket(websocket: WebSocket, symbol: str):
     """WebSocket endpoint for order book depth data"""
     await manager.connect(websocket)
     try:
-        await manager.handle_depth_stream(symbol.upper(), websocket)
+        task = await manager.handle_depth_stream(symbol.upper(), websocket)
+        await manager.wait_for_stream(websocket, task)
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for depth {symbol}")
     except Exception as e:
@@ -419,63 +672,88 @@ async def depth_websocket(websocket: WebSocket, symbol: str):
         manager.disconnect(websocket)
 
 
+# Stream type -> subscribe call, taking (websocket, symbol, interval)
+SUBSCRIBE_HANDLERS = {
+    "ticker": lambda websocket, symbol, interval: manager.handle_ticker_stream(symbol, websocket),
+    "kline": lambda websocket, symbol, interval: manager.handle_kline_stream(symbol, interval, websocket),
+    "depth": lambda websocket, symbol, interval: manager.handle_depth_stream(symbol, websocket),
+    "user_data": lambda websocket, symbol, interval: manager.handle_user_data_stream(websocket),
+    "mini_ticker": lambda websocket, symbol, interval: manager.handle_mini_ticker_stream(websocket),
+}
+SYMBOL_STREAMS = {"ticker", "kline", "depth"}
+
+
+async def subscribe_action(websocket: WebSocket, data: dict):
+    stream_type = data.get("type")
+    symbol = data.get("symbol", "").upper()
+    handler = SUBSCRIBE_HANDLERS.get(stream_type)
+    if handler is None or (stream_type in SYMBOL_STREAMS and not symbol):
+        await manager.send_personal_message({
+            "type": "error",
+            "message": f"Invalid subscription request: {data}"
+        }, websocket)
+        return
+    await handler(websocket, symbol, data.get("interval", "1m"))
+
+
+async def unsubscribe_action(websocket: WebSocket, data: dict):
+    stream_type = data.get("type")
+    symbol = data.get("symbol", "").upper()
+    if stream_type == "kline" and symbol:
+        symbol = f"{symbol}_{data.get('interval', '1m')}"
+    manager.stop_stream(websocket, stream_type, symbol)
+
+
+async def ping_action(websocket: WebSocket, data: dict):
+    await manager.send_personal_message({
+        "type": "pong",
+        "timestamp": int(time.time() * 1000)
+    }, websocket)
+
+
+TRADE_ACTIONS = {
+    "subscribe": subscribe_action,
+    "unsubscribe": unsubscribe_action,
+    "ping": ping_action,
+}
+
+
 @router.websocket("/trade")
 async def trade_websocket(websocket: WebSocket):
     """Main WebSocket endpoint that handles multiple types of subscriptions"""
     await manager.connect(websocket)
     try:
         # Send connection confirmation
-        await websocket.send_json({
+        await manager.send_personal_message({
             "type": "connection",
             "status": "connected",
             "timestamp": int(time.time() * 1000)
-        })
+        }, websocket)
         
         while True:
             try:
                 # Receive subscription requests from client with timeout
-                data = await asyncio.wait_for(websocket.receive_json(), timeout=30.0)
-                
-                action = data.get("action")
-                if action == "subscribe":
-                    stream_type = data.get("type")
-                    symbol = data.get("symbol", "").upper()
-                    interval = data.get("interval", "1m")
-                    
-                    if stream_type == "ticker" and symbol:
-                        asyncio.create_task(manager.handle_ticker_stream(symbol, websocket))
-                    elif stream_type == "kline" and symbol:
-                        asyncio.create_task(manager.handle_kline_stream(symbol, interval, websocket))
-                    elif stream_type == "depth" and symbol:
-                        asyncio.create_task(manager.handle_depth_stream(symbol, websocket))
-                    elif stream_type == "user_data":
-                        asyncio.create_task(manager.handle_user_data_stream(websocket))
-                    elif stream_type == "mini_ticker":
-                        asyncio.create_task(manager.handle_mini_ticker_stream(websocket))
-                    else:
-                        await websocket.send_json({
-                            "type": "error",
-                            "message": f"Invalid subscription request: {data}"
-                        })
-                
-                elif action == "unsubscribe":
-                    stream_type = data.get("type")
-                    symbol = data.get("symbol", "").upper()
-                    manager.stop_stream(websocket, stream_type, symbol)
-                
-                elif action == "ping":
-                    await websocket.send_json({
-                        "type": "pong",
-                        "timestamp": int(time.time() * 1000)
-                    })
-                    
+                raw = await manager.receive_text(websocket, timeout=30.0)
             except asyncio.TimeoutError:
                 # Send heartbeat
-                await websocket.send_json({
+                await manager.send_personal_message({
                     "type": "heartbeat",
                     "timestamp": int(time.time() * 1000)
-                })
+                }, websocket)
                 continue
+            
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                await manager.send_personal_message({
+                    "type": "error",
+                    "message": "Invalid JSON message"
+                }, websocket)
+                continue
+            
+            action = TRADE_ACTIONS.get(data.get("action")) if isinstance(data, dict) else None
+            if action:
+                await action(websocket, data)
                 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected for trade endpoint")
@@ -484,10 +762,3 @@ async def trade_websocket(websocket: WebSocket):
     finally:
         manager.stop_stream(websocket)
         manager.disconnect(websocket)
-
-
-@router.on_event("shutdown")
-async def shutdown_event():
-    """Clean up WebSocket connections on shutdown"""
-    await manager.close_binance_client()
-    logger.info("WebSocket manager shutdown complete")
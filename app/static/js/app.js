@@ -26,6 +26,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // WebSocket management
 let ws = null;
+const textDecoder = new TextDecoder();
 let reconnectAttempts = 0;
 const maxReconnectAttempts = 5;
 let priceChart = null;
@@ -122,6 +123,8 @@ function connectWebSocket() {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
         const wsUrl = `${protocol}//${window.location.host}/ws/trade`;
         ws = new WebSocket(wsUrl);
+        // Server sends JSON as binary frames
+        ws.binaryType = 'arraybuffer';
         
         ws.onopen = function() {
             console.log('WebSocket connected');
@@ -134,7 +137,8 @@ function connectWebSocket() {
         
         ws.onmessage = function(event) {
             try {
-                const data = JSON.parse(event.data);
+                const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+                const data = JSON.parse(text);
                 handleWebSocketMessage(data);
             } catch (error) {
                 console.error('Error parsing WebSocket message:', error);
@@ -177,6 +181,12 @@ function subscribeToStreams() {
 }
 
 function handleWebSocketMessage(data) {
+    // Updates may arrive batched into a single array frame
+    if (Array.isArray(data)) {
+        data.forEach(handleWebSocketMessage);
+        return;
+    }
+    
     switch (data.type) {
         case 'mini_ticker':
             updateTickerDisplay(data);
@@ -212,8 +222,11 @@ function handleWebSocketMessage(data) {
 }
 
 function updateTickerDisplay(tickerData) {
+    // Prices arrive as the decimal strings Binance sends
+    const price = parseFloat(tickerData.price);
+    
     // Update the price chart with the latest price
-    updatePriceChart(tickerData.price, tickerData.timestamp);
+    updatePriceChart(price, tickerData.timestamp);
     
     // You can also update a ticker display or other UI elements
     // For example, show the latest price for the current symbol
@@ -222,7 +235,7 @@ function updateTickerDisplay(tickerData) {
         // Update UI with current symbol price
         const priceElement = document.getElementById('currentPrice');
         if (priceElement) {
-            priceElement.textContent = `Current Price: $${tickerData.price.toFixed(2)}`;
+            priceElement.textContent = `Current Price: $${price.toFixed(2)}`;
         }
     }
 }
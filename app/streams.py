@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from binance import AsyncClient, BinanceSocketManager
+
+from app.bot import EnhancedTradingBot
+
+logger = logging.getLogger("BotStreams")
+
+
+class BotStreams:
+    RECONNECT_DELAY = 5
+
+    def __init__(self, bot: EnhancedTradingBot):
+        """
+        Keep the bot's balance and price cache fed from Binance WebSocket streams
+
+        Args:
+            bot (EnhancedTradingBot): Bot whose cache is updated
+        """
+        self.bot = bot
+        self.client: Optional[AsyncClient] = None
+        self.bm: Optional[BinanceSocketManager] = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self, api_key: str, api_secret: str, testnet: bool = True):
+        """Start the mark price and user data streams"""
+        try:
+            self.client = await AsyncClient.create(
+                api_key=api_key,
+                api_secret=api_secret,
+                testnet=testnet
+            )
+            self.bm = BinanceSocketManager(self.client, user_timeout=60)
+        except Exception as e:
+            # The bot falls back to REST calls while the cache is empty
+            logger.error(f"Failed to start bot streams: {e}")
+            return
+
+        self.tasks = [
+            asyncio.create_task(self._run(
+                self.bm.all_mark_price_socket, self._on_mark_price, reset=self._reset_prices
+            ))
+        ]
+        if api_key and api_secret:
+            self.tasks.append(asyncio.create_task(self._run(
+                self.bm.futures_user_socket, self._on_user_data,
+                on_open=self._seed_balance, reset=self._reset_balance
+            )))
+        logger.info("Bot streams started")
+
+    async def stop(self):
+        """Cancel the streams and close the Binance client"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+        if self.client:
+            await self.client.close_connection()
+            self.client = None
+            self.bm = None
+            logger.info("Bot streams stopped")
+
+    async def _run(self, socket_factory, handler, on_open=None, reset=None):
+        """Consume a socket forever, reconnecting after errors"""
+        while True:
+            try:
+                async with socket_factory() as stream:
+                    if on_open:
+                        await on_open()
+                    while True:
+                        res = await stream.recv()
+                        if isinstance(res, dict) and 'data' in res:
+                            res = res['data']
+                        if isinstance(res, dict) and res.get('e') == 'error':
+                            logger.error(f"Socket error in bot stream: {res}")
+                            break
+                        handler(res)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in bot stream: {e}")
+            finally:
+                # Cached values are only trusted while the stream is live
+                if reset:
+                    reset()
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def _seed_balance(self):
+        """Load the starting balance, since ACCOUNT_UPDATE is only sent on changes"""
+        # Same rate limits and 418/429 back-off as the bot's own REST calls
+        account_info = await self.bot._call(5, self.client.futures_account)
+        for asset in account_info['assets']:
+            if asset['asset'] == 'USDT':
+                self.bot.cache['USDT_balance'] = float(asset['walletBalance'])
+                break
+
+    def _reset_prices(self):
+        self.bot.cache['price'].clear()
+
+    def _reset_balance(self):
+        self.bot.cache['USDT_balance'] = None
+
+    def _on_mark_price(self, res):
+        prices = self.bot.cache['price']
+        for item in res if isinstance(res, list) else [res]:
+            prices[item['s']] = float(item['p'])
+
+    def _on_user_data(self, res):
+        if res.get('e') != 'ACCOUNT_UPDATE':
+            return
+        for balance in res['a']['B']:
+            if balance['a'] == 'USDT':
+                self.bot.cache['USDT_balance'] = float(balance['wb'])
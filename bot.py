@@ -1,21 +1,192 @@
 import logging
 import argparse
-from binance import Client
-from binance.exceptions import BinanceAPIException, BinanceOrderException
+import asyncio
+import atexit
+import hashlib
+import hmac
+import json
+import math
+import queue
+import time
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+from decimal import Decimal
+import aiohttp
+import orjson
+import ormsgpack
+from binance import AsyncClient, BinanceSocketManager
+from binance.exceptions import (
+    BinanceAPIException, BinanceOrderException, BinanceRequestException, BinanceWebsocketUnableToConnect
+)
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
-# Set up logging
+# Set up logging; records are queued and written to the sinks on a background thread
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler("trading_bot.log", delay=True),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+# The sinks apply the full format, so the queue handler only merges the message args
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("trading_bot.log"),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger("TradingBot")
 
+# Order types that python-binance places through the algo order endpoint
+CONDITIONAL_ORDER_TYPES = ("STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET")
+
+# Binance accepts at most this many orders per batchOrders request
+MAX_BATCH_ORDERS = 5
+
+# Last exchange info seen by the bot, shared across runs so a fresh process can
+# validate orders without fetching it again
+EXCHANGE_INFO_SNAPSHOT = Path("~/.cache/tradingbot/exchange_info.msgpack").expanduser()
+EXCHANGE_INFO_TTL = 43200
+# Upper bound on memoized quantity checks per bot
+VALID_QTY_CACHE_SIZE = 1024
+
+
+def step_decimals(step_size):
+    """Return the decimal places of a step size that is a power of ten no larger than 1, else None"""
+    _, digits, exponent = step_size.normalize().as_tuple()
+    if digits == (1,) and exponent <= 0:
+        return -exponent
+    return None
+
+
+def is_step_multiple(quantity, step_size, decimals=None):
+    """
+    Check that a quantity is an exact multiple of a Decimal step size
+    
+    Args:
+        quantity (float or str): Quantity to check
+        step_size (Decimal): LOT_SIZE step size
+        decimals (int): step_decimals(step_size), if precomputed
+        
+    Returns:
+        bool: True if the quantity is a multiple of the step size
+    """
+    quantity_str = str(quantity)
+    if decimals is not None and 'e' not in quantity_str and 'E' not in quantity_str:
+        # A multiple of 10**-decimals has no significant digits past that place
+        fraction = quantity_str.partition('.')[2]
+        return len(fraction.rstrip('0')) <= decimals
+    return Decimal(quantity_str) % step_size == 0
+
+
+def index_symbols(exchange_info):
+    """Index exchange info symbol entries by symbol name"""
+    return {s['symbol']: s for s in exchange_info['symbols']}
+
+
+def lot_step_size(symbol_info):
+    """Return a symbol's LOT_SIZE step size as a Decimal, or None without that filter"""
+    for f in symbol_info['filters']:
+        if f['filterType'] == 'LOT_SIZE':
+            return Decimal(f['stepSize'])
+    return None
+
+
+def load_exchange_info_snapshot(path=EXCHANGE_INFO_SNAPSHOT, ttl=EXCHANGE_INFO_TTL):
+    """
+    Read the exchange info snapshot if it is younger than the TTL, indexed by symbol
+    
+    Args:
+        path (Path): Snapshot file path
+        ttl (float): Maximum snapshot age in seconds
+        
+    Returns:
+        tuple: (symbol index, age in seconds), or None if missing, stale or unreadable
+    """
+    try:
+        age = time.time() - path.stat().st_mtime
+        if age >= ttl:
+            return None
+        return index_symbols(ormsgpack.unpackb(path.read_bytes())), age
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_exchange_info_snapshot(exchange_info, path=EXCHANGE_INFO_SNAPSHOT):
+    """Write the exchange info snapshot, logging instead of failing on I/O errors"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(ormsgpack.packb(exchange_info))
+    except OSError as e:
+        logger.warning("Could not save exchange info snapshot: %s", e)
+
+
+class BotAsyncClient(AsyncClient):
+    """AsyncClient that signs with a pre-keyed HMAC and decodes REST responses with orjson"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Copying a keyed HMAC skips re-deriving the key pads for every signed request
+        self._hmac_template = None
+        if self.API_SECRET:
+            self._hmac_template = hmac.new(self.API_SECRET.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def _hmac_signature(self, query_string):
+        assert self._hmac_template, "API Secret required for private endpoints"
+        m = self._hmac_template.copy()
+        m.update(query_string.encode("utf-8"))
+        return m.hexdigest()
+
+    async def _handle_response(self, response):
+        body = await response.read()
+        if not 200 <= response.status < 300:
+            raise BinanceAPIException(response, response.status, body.decode("utf-8", "replace"))
+        if not body:
+            return {}
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException(f"Invalid Response: {body.decode('utf-8', 'replace')}")
+
+
 class BasicBot:
-    def __init__(self, api_key, api_secret, testnet=True):
+    def __init__(self, client, snapshot=None):
+        """
+        Wrap a connected async client; use BasicBot.create() to build one
+        
+        Args:
+            client (AsyncClient): Connected Binance async client
+            snapshot (tuple): Already loaded load_exchange_info_snapshot() result, if any
+        """
+        self.client = client
+        # Exchange info rarely changes, so it is cached instead of fetched per order
+        self._exchange_info_ts = None
+        self._exchange_info_ttl = EXCHANGE_INFO_TTL
+        self._exchange_info_lock = asyncio.Lock()
+        self._symbol_index = {}
+        self._lot_size_index = {}
+        self._lot_size_decimals = {}
+        # (symbol, quantity string) -> step check result, cleared whenever exchange info changes
+        self._valid_qty_cache = {}
+        # Latest order state pushed by the user data stream, keyed by order ID
+        self._order_events = {}
+        # Events set on the next pushed update for an order, keyed by order ID
+        self._order_waiters = {}
+        self._user_stream_task = None
+        self._user_stream_ready = None
+        # The disk snapshot is only read and indexed once exchange info is first needed
+        self._snapshot = snapshot
+        self._snapshot_pending = True
+
+    @classmethod
+    async def create(cls, api_key, api_secret, testnet=True, user_stream=False, ws_api=False, snapshot=None):
         """
         Initialize the trading bot with API credentials
         
@@ -23,15 +194,159 @@ class BasicBot:
             api_key (str): Binance API key
             api_secret (str): Binance API secret
             testnet (bool): Whether to use testnet (default: True)
+            user_stream (bool): Start the user data stream up front instead of on first wait (default: False)
+            ws_api (bool): Also open the WebSocket API connection used to place orders (default: False)
+            snapshot (tuple): Already loaded load_exchange_info_snapshot() result, if any
         """
         try:
-            self.client = Client(api_key, api_secret, testnet=testnet)
+            # Keep connections alive across calls and open the futures one up front,
+            # so orders don't pay for a TCP/TLS handshake
+            client = await BotAsyncClient.create(
+                api_key, api_secret, testnet=testnet,
+                session_params={"connector": aiohttp.TCPConnector(limit=16, keepalive_timeout=75)}
+            )
+            bot = cls(client, snapshot)
+            warm_ups = [client.futures_ping()]
+            if ws_api:
+                warm_ups.append(bot._open_ws_api())
+            await asyncio.gather(*warm_ups)
+            if user_stream:
+                await bot._start_user_stream()
             logger.info("Trading bot initialized successfully")
+            return bot
         except Exception as e:
-            logger.error(f"Failed to initialize client: {e}")
+            logger.error("Failed to initialize client: %s", e)
+            raise
+
+    async def close(self):
+        """Stop the user data stream and close the client's HTTP and WebSocket connections"""
+        if self._user_stream_task:
+            self._user_stream_task.cancel()
+            await asyncio.gather(self._user_stream_task, return_exceptions=True)
+        await self.client.ws_future.close()
+        await self.client.close_connection()
+
+    async def _open_ws_api(self):
+        """Connect to the WebSocket API ahead of the first order; orders fall back to REST if this fails"""
+        try:
+            await self.client.ws_future._ensure_ws_connection()
+        except BinanceWebsocketUnableToConnect as e:
+            logger.warning("Could not open WebSocket API connection: %s", e)
+
+    async def _start_user_stream(self):
+        """Start the user data stream if it is not running, and wait until it is connected or fails"""
+        if self._user_stream_task is None or self._user_stream_task.done():
+            self._user_stream_ready = asyncio.Event()
+            self._user_stream_task = asyncio.create_task(self._run_user_stream())
+        ready = asyncio.ensure_future(self._user_stream_ready.wait())
+        await asyncio.wait([ready, self._user_stream_task], return_when=asyncio.FIRST_COMPLETED)
+        ready.cancel()
+
+    async def _run_user_stream(self):
+        """Record order updates pushed on the futures user data stream"""
+        try:
+            async with BinanceSocketManager(self.client).futures_user_socket() as stream:
+                self._user_stream_ready.set()
+                while True:
+                    res = await stream.recv()
+                    if isinstance(res, dict) and 'data' in res:
+                        res = res['data']
+                    if not isinstance(res, dict):
+                        continue
+                    if res.get('e') == 'error':
+                        logger.error("User data stream error: %s", res)
+                        break
+                    if res.get('e') == 'ORDER_TRADE_UPDATE':
+                        o = res['o']
+                        self._order_events[o['i']] = {
+                            'symbol': o['s'],
+                            'orderId': o['i'],
+                            'status': o['X'],
+                            'side': o['S'],
+                            'type': o['o'],
+                            'origQty': o['q'],
+                            'price': o['p'],
+                            'executedQty': o['z'],
+                            'avgPrice': o['ap']
+                        }
+                        waiter = self._order_waiters.pop(o['i'], None)
+                        if waiter:
+                            waiter.set()
+        except asyncio.CancelledError:
             raise
+        except Exception as e:
+            # Order status falls back to REST without the stream
+            logger.error("User data stream stopped: %s", e)
+        finally:
+            # Wake anyone waiting on an update that can no longer arrive
+            for waiter in self._order_waiters.values():
+                waiter.set()
+            self._order_waiters.clear()
+
+    async def _create_order(self, **params):
+        """Place an order over the WebSocket API, using REST only if it cannot connect"""
+        # Conditional orders go to the algo endpoint, which identifies them by clientAlgoId
+        if params['type'] in CONDITIONAL_ORDER_TYPES:
+            id_field, lookup_field = 'clientAlgoId', 'clientAlgoId'
+            get_order = self.client.futures_get_algo_order
+        else:
+            id_field, lookup_field = 'newClientOrderId', 'origClientOrderId'
+            get_order = self.client.futures_get_order
+        # Use one client order ID on every path, so Binance can tell a retry from a new order
+        client_order_id = params.setdefault(id_field, self.client.CONTRACT_ORDER_PREFIX + self.client.uuid22())
+
+        try:
+            await self.client.ws_future._ensure_ws_connection()
+        except BinanceWebsocketUnableToConnect as e:
+            # Nothing was sent, so placing the order over REST cannot duplicate it
+            logger.warning("WebSocket API unavailable, placing order over REST: %s", e)
+            return await self.client.futures_create_order(**params)
+
+        try:
+            return await self.client.ws_futures_create_order(**params)
+        except BinanceWebsocketUnableToConnect as e:
+            # The order may have reached Binance without a response, so look it up instead of placing it again
+            logger.warning("No WebSocket API response for order %s, checking it over REST: %s", client_order_id, e)
+            return await get_order(symbol=params['symbol'], **{lookup_field: client_order_id})
+
+    async def _get_exchange_info(self):
+        """Return the symbol index, starting from the disk snapshot and refreshing once it is older than the TTL"""
+        async with self._exchange_info_lock:
+            if self._snapshot_pending:
+                self._snapshot_pending = False
+                snapshot = self._snapshot or load_exchange_info_snapshot(ttl=self._exchange_info_ttl)
+                self._snapshot = None
+                if snapshot is not None:
+                    symbol_index, age = snapshot
+                    self._index_symbols(symbol_index)
+                    # Expire the loaded copy when the snapshot itself would have
+                    self._exchange_info_ts = time.monotonic() - age
+            if (self._exchange_info_ts is None
+                    or time.monotonic() - self._exchange_info_ts >= self._exchange_info_ttl):
+                await self._refresh_exchange_info()
+        return self._symbol_index
+
+    async def _refresh_exchange_info(self):
+        exchange_info = await self.client.futures_exchange_info()
+        self._index_symbols(index_symbols(exchange_info))
+        logger.info("Exchange info refreshed")
+        save_exchange_info_snapshot(exchange_info)
+
+    def _index_symbols(self, symbol_index):
+        """Take a symbol index and precompute LOT_SIZE step sizes from it"""
+        self._symbol_index = symbol_index
+        self._lot_size_index = {}
+        for symbol, info in symbol_index.items():
+            step_size = lot_step_size(info)
+            if step_size is not None:
+                self._lot_size_index[symbol] = step_size
+        self._lot_size_decimals = {
+            symbol: step_decimals(step_size) for symbol, step_size in self._lot_size_index.items()
+        }
+        self._exchange_info_ts = time.monotonic()
+        self._valid_qty_cache.clear()
 
-    def get_symbol_info(self, symbol):
+    async def get_symbol_info(self, symbol):
         """
         Get information about a trading symbol
         
@@ -42,16 +357,13 @@ class BasicBot:
             dict: Symbol information or None if not found
         """
         try:
-            exchange_info = self.client.futures_exchange_info()
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    return s
-            return None
+            await self._get_exchange_info()
+            return self._symbol_index.get(symbol)
         except Exception as e:
-            logger.error(f"Error getting symbol info: {e}")
+            logger.error("Error getting symbol info: %s", e)
             return None
 
-    def validate_quantity(self, symbol, quantity):
+    async def validate_quantity(self, symbol, quantity):
         """
         Validate order quantity against symbol's step size
         
@@ -62,23 +374,23 @@ class BasicBot:
         Returns:
             bool: True if quantity is valid, False otherwise
         """
-        symbol_info = self.get_symbol_info(symbol)
+        symbol_info = await self.get_symbol_info(symbol)
         if not symbol_info:
             return False
             
-        # Check LOT_SIZE filter
-        for filter in symbol_info['filters']:
-            if filter['filterType'] == 'LOT_SIZE':
-                step_size = float(filter['stepSize'])
-                # Check if quantity is a multiple of step size
-                if quantity % step_size != 0:
-                    logger.error(f"Quantity {quantity} must be a multiple of step size {step_size}")
-                    return False
-                return True
-                
-        return True
+        key = (symbol, str(quantity))
+        is_valid = self._valid_qty_cache.get(key)
+        if is_valid is None:
+            step_size = self._lot_size_index.get(symbol)
+            is_valid = step_size is None or is_step_multiple(key[1], step_size, self._lot_size_decimals[symbol])
+            if len(self._valid_qty_cache) >= VALID_QTY_CACHE_SIZE:
+                self._valid_qty_cache.clear()
+            self._valid_qty_cache[key] = is_valid
+        if not is_valid:
+            logger.error("Quantity %s must be a multiple of step size %s", quantity, self._lot_size_index[symbol])
+        return is_valid
 
-    def place_market_order(self, symbol, side, quantity):
+    async def place_market_order(self, symbol, side, quantity):
         """
         Place a market order
         
@@ -91,27 +403,27 @@ class BasicBot:
             dict: Order response from Binance
         """
         try:
-            if not self.validate_quantity(symbol, quantity):
+            if not await self.validate_quantity(symbol, quantity):
                 return None
                 
-            logger.info(f"Placing market order: {side} {quantity} {symbol}")
-            order = self.client.futures_create_order(
+            logger.info("Placing market order: %s %s %s", side, quantity, symbol)
+            order = await self._create_order(
                 symbol=symbol,
                 side=side,
-                type=Client.FUTURE_ORDER_TYPE_MARKET,
+                type=AsyncClient.FUTURE_ORDER_TYPE_MARKET,
                 quantity=quantity
             )
-            logger.info(f"Market order placed successfully: {order}")
+            logger.info("Market order placed successfully: %s", order)
             return order
         except BinanceAPIException as e:
-            logger.error(f"API error placing market order: {e}")
+            logger.error("API error placing market order: %s", e)
         except BinanceOrderException as e:
-            logger.error(f"Order error placing market order: {e}")
+            logger.error("Order error placing market order: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error placing market order: {e}")
+            logger.error("Unexpected error placing market order: %s", e)
         return None
 
-    def place_limit_order(self, symbol, side, quantity, price):
+    async def place_limit_order(self, symbol, side, quantity, price):
         """
         Place a limit order
         
@@ -125,29 +437,29 @@ class BasicBot:
             dict: Order response from Binance
         """ 
         try:
-            if not self.validate_quantity(symbol, quantity):
+            if not await self.validate_quantity(symbol, quantity):
                 return None
                 
-            logger.info(f"Placing limit order: {side} {quantity} {symbol} @ {price}")
-            order = self.client.futures_create_order(
+            logger.info("Placing limit order: %s %s %s @ %s", side, quantity, symbol, price)
+            order = await self._create_order(
                 symbol=symbol,
                 side=side,
-                type=Client.FUTURE_ORDER_TYPE_LIMIT,
-                timeInForce=Client.TIME_IN_FORCE_GTC,
+                type=AsyncClient.FUTURE_ORDER_TYPE_LIMIT,
+                timeInForce=AsyncClient.TIME_IN_FORCE_GTC,
                 quantity=quantity,
                 price=price
             )
-            logger.info(f"Limit order placed successfully: {order}")
+            logger.info("Limit order placed successfully: %s", order)
             return order
         except BinanceAPIException as e:
-            logger.error(f"API error placing limit order: {e}")
+            logger.error("API error placing limit order: %s", e)
         except BinanceOrderException as e:
-            logger.error(f"Order error placing limit order: {e}")
+            logger.error("Order error placing limit order: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error placing limit order: {e}")
+            logger.error("Unexpected error placing limit order: %s", e)
         return None
 
-    def place_stop_limit_order(self, symbol, side, quantity, price, stop_price):
+    async def place_stop_limit_order(self, symbol, side, quantity, price, stop_price):
         """
         Place a stop-limit order
         
@@ -162,51 +474,146 @@ class BasicBot:
             dict: Order response from Binance
         """
         try:
-            if not self.validate_quantity(symbol, quantity):
+            if not await self.validate_quantity(symbol, quantity):
                 return None
                 
-            logger.info(f"Placing stop-limit order: {side} {quantity} {symbol} @ {price} (stop: {stop_price})")
-            order = self.client.futures_create_order(
+            logger.info("Placing stop-limit order: %s %s %s @ %s (stop: %s)", side, quantity, symbol, price, stop_price)
+            order = await self._create_order(
                 symbol=symbol,
                 side=side,
-                type=Client.FUTURE_ORDER_TYPE_STOP,
-                timeInForce=Client.TIME_IN_FORCE_GTC,
+                type=AsyncClient.FUTURE_ORDER_TYPE_STOP,
+                timeInForce=AsyncClient.TIME_IN_FORCE_GTC,
                 quantity=quantity,
                 price=price,
                 stopPrice=stop_price
             )
-            logger.info(f"Stop-limit order placed successfully: {order}")
+            logger.info("Stop-limit order placed successfully: %s", order)
             return order
         except BinanceAPIException as e:
-            logger.error(f"API error placing stop-limit order: {e}")
+            logger.error("API error placing stop-limit order: %s", e)
+        except BinanceOrderException as e:
+            logger.error("Order error placing stop-limit order: %s", e)
+        except Exception as e:
+            logger.error("Unexpected error placing stop-limit order: %s", e)
+        return None
+
+    async def place_batch_orders(self, orders):
+        """
+        Place several orders, sending up to MAX_BATCH_ORDERS per request
+        
+        Args:
+            orders (list): Order parameter dicts (symbol, side, type, quantity, ...)
+            
+        Returns:
+            list: One order response or error dict per order, in order
+        """
+        try:
+            for order in orders:
+                if not await self.validate_quantity(order['symbol'], order['quantity']):
+                    return None
+            
+            logger.info("Placing batch of %s orders", len(orders))
+            results = []
+            for i in range(0, len(orders), MAX_BATCH_ORDERS):
+                batch = [dict(order) for order in orders[i:i + MAX_BATCH_ORDERS]]
+                results.extend(await self.client.futures_place_batch_order(batchOrders=batch))
+            logger.info("Batch orders placed: %s", results)
+            return results
+        except BinanceAPIException as e:
+            logger.error("API error placing batch orders: %s", e)
         except BinanceOrderException as e:
-            logger.error(f"Order error placing stop-limit order: {e}")
+            logger.error("Order error placing batch orders: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error placing stop-limit order: {e}")
+            logger.error("Unexpected error placing batch orders: %s", e)
         return None
 
-    def get_order_status(self, symbol, order_id):
+    async def _wait_for_order_update(self, order_id, timeout):
+        """Wait for the next pushed update of an order; returns the latest state, or None on timeout or without a stream"""
+        if not self._user_stream_task or self._user_stream_task.done():
+            return None
+        waiter = self._order_waiters.setdefault(order_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._order_events.get(order_id)
+
+    async def get_order_status(self, symbol, order_id, wait=0):
         """
         Check the status of an order
         
         Args:
             symbol (str): Trading symbol
             order_id (int): Order ID
+            wait (float): Seconds to wait for a pushed update before asking the REST API
             
         Returns:
             dict: Order status information
         """
         try:
-            logger.info(f"Checking status for order {order_id} on {symbol}")
-            status = self.client.futures_get_order(symbol=symbol, orderId=order_id)
-            logger.info(f"Order status: {status}")
+            logger.info("Checking status for order %s on %s", order_id, symbol)
+            status = self._order_events.get(order_id)
+            if status is None and wait:
+                await self._start_user_stream()
+                status = await self._wait_for_order_update(order_id, wait)
+            if status is None:
+                # Not seen on the user data stream (yet), so ask the REST API
+                status = await self.client.futures_get_order(symbol=symbol, orderId=order_id)
+            logger.info("Order status: %s", status)
             return status
         except BinanceAPIException as e:
-            logger.error(f"API error getting order status: {e}")
+            logger.error("API error getting order status: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error getting order status: {e}")
+            logger.error("Unexpected error getting order status: %s", e)
         return None
 
+    async def wait_for_order(self, symbol, order_id, statuses=("FILLED", "CANCELED", "EXPIRED", "REJECTED"),
+                             timeout=None):
+        """
+        Wait until an order reaches one of the given statuses, using pushed updates instead of polling
+        
+        Args:
+            symbol (str): Trading symbol
+            order_id (int): Order ID
+            statuses (tuple): Statuses to wait for (default: final statuses)
+            timeout (float): Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            dict: Latest order status information, or None if it could not be fetched
+        """
+        # Connect first, so no update can slip in between the status check and the stream
+        await self._start_user_stream()
+        status = await self.get_order_status(symbol, order_id)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while status is not None and status['status'] not in statuses:
+            # An update may have been pushed while the status was being fetched
+            latest = self._order_events.get(order_id)
+            if latest is not None and latest is not status:
+                status = latest
+                continue
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            update = await self._wait_for_order_update(order_id, remaining)
+            if update is None or update is status:
+                # Timed out, or the stream is gone; report the latest state from REST
+                try:
+                    return await self.client.futures_get_order(symbol=symbol, orderId=order_id)
+                except Exception as e:
+                    logger.error("Error getting order status: %s", e)
+                    return status
+            status = update
+        return status
+
+# Order type -> (BasicBot method, argument names passed to it from the CLI)
+DISPATCH = {
+    "MARKET": (BasicBot.place_market_order, ("symbol", "side", "quantity")),
+    "LIMIT": (BasicBot.place_limit_order, ("symbol", "side", "quantity", "price")),
+    "STOP_LIMIT": (BasicBot.place_stop_limit_order, ("symbol", "side", "quantity", "price", "stop_price")),
+}
+
+
 def main():
     """Main function to handle command-line interface"""
     parser = argparse.ArgumentParser(description="Binance Futures Trading Bot")
@@ -214,38 +621,115 @@ def main():
     # Required arguments
     parser.add_argument("--api_key", required=True, help="Binance API Key")
     parser.add_argument("--api_secret", required=True, help="Binance API Secret")
+    sub = parser.add_subparsers(dest="command", required=True)
     
-    # Order arguments
-    parser.add_argument("--symbol", required=True, help="Trading symbol (e.g., BTCUSDT)")
-    parser.add_argument("--side", required=True, choices=["BUY", "SELL"], help="Order side")
-    parser.add_argument("--type", required=True, choices=["MARKET", "LIMIT", "STOP_LIMIT"], 
-                        help="Order type")
-    parser.add_argument("--quantity", required=True, type=float, help="Order quantity")
+    # Place a single order
+    order_parser = sub.add_parser("order", help="Place a new order")
+    order_parser.add_argument("--symbol", required=True, help="Trading symbol (e.g., BTCUSDT)")
+    order_parser.add_argument("--side", required=True, choices=["BUY", "SELL"], help="Order side")
+    order_parser.add_argument("--type", required=True, choices=list(DISPATCH), 
+                              help="Order type")
+    order_parser.add_argument("--quantity", required=True, type=float, help="Order quantity")
+    order_parser.add_argument("--price", type=float, help="Order price (required for LIMIT and STOP_LIMIT)")
+    order_parser.add_argument("--stop_price", type=float, help="Stop price (required for STOP_LIMIT)")
     
-    # Optional arguments
-    parser.add_argument("--price", type=float, help="Order price (required for LIMIT and STOP_LIMIT)")
-    parser.add_argument("--stop_price", type=float, help="Stop price (required for STOP_LIMIT)")
-    parser.add_argument("--order_id", type=int, help="Order ID to check status")
+    # Check an existing order
+    status_parser = sub.add_parser("status", help="Check an order's status")
+    status_parser.add_argument("--symbol", required=True, help="Trading symbol (e.g., BTCUSDT)")
+    status_parser.add_argument("--order_id", required=True, type=int, help="Order ID to check status")
+    status_parser.add_argument("--wait", type=float,
+                               help="Wait up to this many seconds for the order to be filled, canceled or expired")
+    
+    # Place several orders together
+    batch_parser = sub.add_parser("batch", help="Place a batch of orders")
+    batch_parser.add_argument("file", help="JSON file with a list of orders to place together")
     
     args = parser.parse_args()
     
-    # Validate arguments based on order type
-    if args.type in ["LIMIT", "STOP_LIMIT"] and not args.price:
-        parser.error(f"{args.type} order requires --price")
+    if args.command == "order":
+        # Validate arguments based on order type
+        if args.type in ["LIMIT", "STOP_LIMIT"] and not args.price:
+            parser.error(f"{args.type} order requires --price")
+        
+        if args.type == "STOP_LIMIT" and not args.stop_price:
+            parser.error("STOP_LIMIT order requires --stop_price")
+        
+        quantities = [(args.symbol, args.quantity)]
+    
+    elif args.command == "batch":
+        try:
+            with open(args.file) as f:
+                args.batch_orders = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not read batch file: {e}")
+        if not isinstance(args.batch_orders, list) or not args.batch_orders:
+            parser.error("Batch file must contain a non-empty list of orders")
+        for i, order in enumerate(args.batch_orders):
+            if not isinstance(order, dict) or 'symbol' not in order or 'quantity' not in order:
+                parser.error(f"Batch order {i} must be an object with symbol and quantity")
+            quantity = order['quantity']
+            try:
+                # bool is an int subclass, so true/false would otherwise pass as 1/0
+                valid = not isinstance(quantity, bool) and math.isfinite(float(quantity)) and float(quantity) > 0
+            except (TypeError, ValueError):
+                valid = False
+            if not valid:
+                parser.error(f"Batch order {i} has an invalid quantity: {quantity!r}")
+        quantities = [(order['symbol'], order['quantity']) for order in args.batch_orders]
     
-    if args.type == "STOP_LIMIT" and not args.stop_price:
-        parser.error("STOP_LIMIT order requires --stop_price")
+    # Check quantities against the last known step sizes before connecting; the
+    # snapshot is decoded once here and the bot reuses it
+    args.snapshot = None
+    if args.command != "status":
+        args.snapshot = load_exchange_info_snapshot()
+        symbol_index = args.snapshot[0] if args.snapshot else {}
+        for symbol, quantity in quantities:
+            step_size = lot_step_size(symbol_index[symbol]) if symbol in symbol_index else None
+            if step_size is not None and not is_step_multiple(quantity, step_size, step_decimals(step_size)):
+                parser.error(f"Quantity {quantity} must be a multiple of step size {step_size}")
     
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(run(args))
+
+
+async def run(args):
+    """Run the requested command with a connected bot"""
     # Initialize the bot
     try:
-        bot = BasicBot(args.api_key, args.api_secret)
+        # Single orders go over the WebSocket API, so open that connection alongside the REST one
+        bot = await BasicBot.create(args.api_key, args.api_secret, ws_api=args.command == "order",
+                                    snapshot=args.snapshot)
     except Exception as e:
         print(f"Failed to initialize trading bot: {e}")
         return
     
-    # Check order status if order_id is provided
-    if args.order_id:
-        status = bot.get_order_status(args.symbol, args.order_id)
+    try:
+        await execute(bot, args)
+    finally:
+        await bot.close()
+
+
+async def execute(bot, args):
+    """Check an order's status or place new orders, printing the result"""
+    if args.command == "batch":
+        results = await bot.place_batch_orders(args.batch_orders)
+        if results is None:
+            print("Failed to place batch orders. Check logs for details.")
+            return
+        for order, result in zip(args.batch_orders, results):
+            if 'orderId' in result:
+                print(f"Order ID: {result['orderId']} ({result['side']} {result['origQty']} {result['symbol']} {result['type']})")
+            else:
+                print(f"Failed {order.get('side', '')} {order['quantity']} {order['symbol']}: {result.get('msg')}")
+        return
+    
+    # Check order status
+    if args.command == "status":
+        if args.wait:
+            status = await bot.wait_for_order(args.symbol, args.order_id, timeout=args.wait)
+        else:
+            status = await bot.get_order_status(args.symbol, args.order_id)
         if status:
             print(f"Order Status: {status['status']}")
             print(f"Executed Quantity: {status['executedQty']}")
@@ -254,12 +738,8 @@ def main():
         return
     
     # Place new order
-    if args.type == "MARKET":
-        result = bot.place_market_order(args.symbol, args.side, args.quantity)
-    elif args.type == "LIMIT":
-        result = bot.place_limit_order(args.symbol, args.side, args.quantity, args.price)
-    elif args.type == "STOP_LIMIT":
-        result = bot.place_stop_limit_order(args.symbol, args.side, args.quantity, args.price, args.stop_price)
+    place_order, fields = DISPATCH[args.type]
+    result = await place_order(bot, *(getattr(args, field) for field in fields))
     
     if result:
         print(f"Order placed successfully!")
@@ -0,0 +1,63 @@
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+from app.binance_async import AsyncBinanceClient
+
+
+class FakeResponse:
+    status = 200
+
+    async def read(self):
+        return b'{}'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, headers=None):
+        self.requests.append((method, url))
+        return FakeResponse()
+
+
+class FuturesCreateOrderTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.session = FakeSession()
+        self.client = AsyncBinanceClient("key", "secret", self.session)
+
+    def sent(self):
+        method, url = self.session.requests[-1]
+        parts = urlsplit(url)
+        return method, parts.path, {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+    async def test_stop_market_goes_to_algo_endpoint(self):
+        await self.client.futures_create_order(
+            symbol="BTCUSDT", side="SELL", type="STOP_MARKET", quantity=0.001, stopPrice=25000
+        )
+        method, path, params = self.sent()
+        self.assertEqual(method, "POST")
+        self.assertEqual(path, "/fapi/v1/algoOrder")
+        self.assertEqual(params["algoType"], "CONDITIONAL")
+        self.assertEqual(params["triggerPrice"], "25000")
+        self.assertNotIn("stopPrice", params)
+        self.assertIn("clientAlgoId", params)
+        self.assertNotIn("newClientOrderId", params)
+        self.assertIn("signature", params)
+
+    async def test_limit_goes_to_order_endpoint(self):
+        await self.client.futures_create_order(
+            symbol="BTCUSDT", side="BUY", type="LIMIT", quantity=0.001, price=25000, timeInForce="GTC"
+        )
+        method, path, params = self.sent()
+        self.assertEqual((method, path), ("POST", "/fapi/v1/order"))
+        self.assertNotIn("algoType", params)
+
+
+if __name__ == "__main__":
+    unittest.main()